@@ -0,0 +1,172 @@
+"""Tk-free prompt analysis engine.
+
+Produces the same highlight spans, analysis details and suggestions that the GUI
+shows, but as plain data so it can run headless (batch linting, CI, tooling).
+"""
+import re
+
+from matcher import PromptMatcher
+from prompt_data import (PROMPT_ELEMENTS, PROMPT_TECHNIQUES_DATA, GENERAL_TIPS, SUGGESTION_RULES,
+                         TECHNIQUE_RULES, MAX_SUGGESTIONS)
+from profiling import stage
+from rules import KEYWORD_PREFIX, RuleSet
+from structure import detect_sections
+from tokens import default_estimator
+
+DEFAULT_RULES = RuleSet(SUGGESTION_RULES, TECHNIQUE_RULES, PROMPT_TECHNIQUES_DATA, GENERAL_TIPS, MAX_SUGGESTIONS)
+
+# Extra patterns matched in the same pass as the elements, keyed by check name
+SUGGESTION_PATTERNS = {
+    "rag_context": r'(?i)\b(context:|based on)\b',
+    "rag_question": r'(?i)\b(question:|what is|how does)\b',
+    "negation": r'(?i)\b(not|don\'t|never|avoid|without)\b',
+    "reasoning": r'(?i)\b(calculate|math|logic|reason|solve)\b',
+    # Section markers for the structural detector (see structure.py)
+    "io_input": r'(?i)\binput:',
+    "io_output": r'(?i)\boutput:',
+    "react_thought": r'(?i)\bthought:',
+    "react_action": r'(?i)\baction:',
+    "react_observation": r'(?i)\bobservation:',
+    # Template slots ([...], {{...}}, {name}, <<...>>) for the prefix-cache layout check (see layout.py)
+    "placeholder": r'\[[^\[\]\n]{1,200}\](?!\()|\{\{[^{}\n]{1,200}\}\}|\{[A-Za-z_]\w*\}|<<[^<>\n]{1,200}>>',
+}
+
+
+def build_matcher(elements, rules=DEFAULT_RULES):
+    """Compiles the element table, suggestion checks and rule keywords into one matcher."""
+    patterns = {element: config["keywords_regex"] for element, config in elements.items()}
+    patterns.update(SUGGESTION_PATTERNS)
+    patterns.update({KEYWORD_PREFIX + keyword: "(?i)" + re.escape(keyword) for keyword in rules.keywords()})
+    return PromptMatcher(patterns)
+
+
+_DEFAULT_MATCHER = None
+
+
+def default_matcher():
+    """The matcher for the built-in tables, compiled on first use and then shared."""
+    global _DEFAULT_MATCHER
+    if _DEFAULT_MATCHER is None:
+        _DEFAULT_MATCHER = build_matcher(PROMPT_ELEMENTS)
+    return _DEFAULT_MATCHER
+
+
+def __getattr__(name):
+    # DEFAULT_MATCHER is still importable, but importing this module no longer compiles it
+    if name == "DEFAULT_MATCHER":
+        return default_matcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class AnalysisResult:
+    """Plain-data result of analysing one prompt."""
+
+    def __init__(self, prompt, store, found_elements, analysis_details, suggestions, elements=PROMPT_ELEMENTS):
+        self.prompt = prompt
+        self.store = store # SpanStore with every element, check and keyword match
+        self.elements = elements
+        self.found_elements = found_elements
+        self.analysis_details = analysis_details
+        self.suggestions = suggestions # List of (suggestion_text, detail_text)
+
+    @property
+    def spans(self):
+        """List of (element, start, end) character offsets, grouped by element."""
+        grouped = self.store.group(self.elements)
+        return [(element, start, end) for element in self.elements for start, end in grouped.get(element, ())]
+
+    def to_dict(self):
+        """JSON-serialisable view of the result (the prompt text itself is omitted)."""
+        return {
+            "spans": [[element, start, end] for element, start, end in self.spans],
+            "found_elements": sorted(self.found_elements),
+            "analysis_details": self.analysis_details,
+            "suggestions": [{"text": text, "detail": detail} for text, detail in self.suggestions],
+        }
+
+
+class PromptAnalyzer:
+    """Finds prompt elements, structural patterns and suggestions without any GUI."""
+
+    def __init__(self, elements=None, rules=None, estimator=None):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.tokens = estimator or default_estimator() # TokenEstimator (see tokens.py)
+        if elements is None and rules is None:
+            self.elements, self.matcher = PROMPT_ELEMENTS, default_matcher()
+        else:
+            self.elements = PROMPT_ELEMENTS if elements is None else elements
+            self.matcher = build_matcher(self.elements, self.rules)
+
+    def analyze(self, prompt):
+        """Runs the full pipeline on an already-stripped prompt string."""
+        with stage("scan"):
+            store = self.matcher.scan(prompt) # Single pass over the text
+        with stage("tokens"):
+            tokens = self.tokens.count(prompt)
+        with stage("summarize"):
+            found_elements, analysis_details = self.summarize(len(prompt.split()), store.counts(), store, tokens=tokens)
+        with stage("suggest"):
+            suggestions = self.suggest(prompt, found_elements, analysis_details, store.counts())
+        return AnalysisResult(prompt, store, found_elements, analysis_details, suggestions, self.elements)
+
+    def find_elements(self, prompt, store=None):
+        """Returns (spans, found_elements, analysis_details) for the prompt."""
+        if store is None:
+            store = self.matcher.scan(prompt)
+        found_elements, analysis_details = self.summarize(len(prompt.split()), store.counts(), store)
+        spans = AnalysisResult(prompt, store, found_elements, analysis_details, [], self.elements).spans
+        return spans, found_elements, analysis_details
+
+    def summarize(self, word_count, counts, store=None, sections=None, tokens=None):
+        """Builds (found_elements, analysis_details) from per-pattern match counts.
+
+        sections, if given, are precomputed section counts (see structure.py);
+        otherwise they are detected from the store. tokens, if given, is the
+        estimated token count of the prompt.
+        """
+        found_elements = {element for element in self.elements if counts.get(element)}
+        analysis_details = {"length": word_count} # Store analysis details
+        if tokens is not None:
+            analysis_details["tokens"] = tokens
+
+        # Store counts for specific structural elements
+        if counts.get("Example Marker") and "Example Marker" in self.elements:
+            analysis_details["examples_found"] = counts["Example Marker"]
+        if counts.get("CoT Trigger") and "CoT Trigger" in self.elements:
+             analysis_details["cot_trigger_found"] = True
+
+        # --- Structural Pattern Checks (More Thorough Analysis) ---
+        if sections is None:
+            sections = detect_sections(store) # One linear pass over the section markers
+        # Check for RAG-like structure (Context + Question)
+        if sections["rag"]:
+             analysis_details["rag_structure_detected"] = True
+        # Check for potential Few-shot structure (multiple examples)
+        if analysis_details.get("examples_found", 0) >= 2:
+             analysis_details["few_shot_structure_detected"] = True
+        if sections["input_output"]:
+             analysis_details["input_output_pairs"] = sections["input_output"]
+        # Check for CoT structure
+        if analysis_details.get("cot_trigger_found", False):
+             analysis_details["cot_structure_detected"] = True
+        # Check for ReAct structure (Thought -> Action -> Observation cycles)
+        if sections["react"]:
+             analysis_details["react_cycles"] = sections["react"]
+             analysis_details["react_structure_detected"] = True
+
+        return found_elements, analysis_details
+
+    def suggest(self, prompt, found_elements, analysis_details, counts=None):
+        """Returns an ordered list of (suggestion_text, detail_text) pairs.
+
+        counts is {pattern name: number of matches}, e.g. SpanStore.counts().
+        """
+        if counts is None:
+            counts = self.matcher.scan(prompt).counts()
+        facts = self.rules.facts(prompt, found_elements, analysis_details, counts)
+        return self.rules.evaluate(facts, analysis_details["length"])
+
+
+def analyze(prompt):
+    """Convenience wrapper: analyse a prompt with the default element table."""
+    return PromptAnalyzer().analyze(prompt)
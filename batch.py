@@ -0,0 +1,283 @@
+"""Headless batch linting: analyse every prompt file under a directory.
+
+Files are fanned out over a process pool and results are streamed to stdout as
+JSON Lines (one object per file) as soon as each worker finishes.
+
+With a manifest, each file's size, modification time, content hash and result
+are kept on disk between runs, and only files whose content changed are
+analysed again. The manifest is tied to a ruleset version (a digest of the
+element and rule tables and of the analysis code) and is discarded as a
+whole when that changes. watch_batch() re-lints as files change.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from multiprocessing import Pool
+
+from analyzer import PromptAnalyzer
+from stream import analyze_path
+
+DEFAULT_EXTENSIONS = (".txt", ".md", ".prompt")
+STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024 # Larger files are scanned chunk by chunk (no spans)
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST = ".prompt-lint.json" # Inside the linted directory
+WATCH_INTERVAL = 0.5 # Seconds between polls for changed files in watch mode
+WATCH_DEBOUNCE_MS = 350 # Quiet time after the last change before re-linting (as in the GUI)
+
+_worker_analyzer = None # One analyzer per worker process
+
+
+def find_prompt_files(directory, extensions=DEFAULT_EXTENSIONS):
+    """Yields prompt file paths under directory in a stable (sorted) order."""
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".")) # Skip .git etc.
+        for filename in sorted(filenames):
+            if filename.lower().endswith(tuple(extensions)):
+                yield os.path.join(dirpath, filename)
+
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = PromptAnalyzer()
+
+
+def analyze_file(path, analyzer=None):
+    """Analyses one file and returns a JSON-serialisable record.
+
+    Files of STREAM_THRESHOLD_BYTES or more are memory-mapped and scanned in
+    chunks; their records carry element counts instead of spans.
+    """
+    analyzer = analyzer or _worker_analyzer or PromptAnalyzer()
+    try:
+        if os.path.getsize(path) >= STREAM_THRESHOLD_BYTES:
+            record = {"path": path, "streamed": True}
+            record.update(analyze_path(path, analyzer).to_dict())
+            return record
+        with open(path, encoding="utf-8", errors="replace") as f:
+            prompt = f.read().strip()
+    except OSError as e:
+        return {"path": path, "error": str(e)}
+    record = {"path": path}
+    record.update(analyzer.analyze(prompt).to_dict())
+    return record
+
+
+def run_batch(directory, jobs=None, out=None, extensions=DEFAULT_EXTENSIONS, chunksize=16, manifest=None):
+    """Lints all prompt files under directory, writing one JSON line per file.
+
+    Returns the process exit code: 1 if any file failed to read or is missing a
+    clear instruction ("[!]" suggestion), otherwise 0. manifest (a path or a
+    LintManifest) serves unchanged files from earlier results.
+    """
+    out = out or sys.stdout
+    paths = list(find_prompt_files(directory, extensions))
+    exit_code = 0
+
+    def emit(record):
+        nonlocal exit_code
+        if _failed(record):
+            exit_code = 1
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if manifest is None:
+        for record in _analyze_all(paths, jobs, chunksize):
+            emit(record)
+        return exit_code
+
+    if not isinstance(manifest, LintManifest):
+        manifest = LintManifest(manifest)
+    for record, _ in lint_with_manifest(directory, paths, manifest, jobs, chunksize):
+        emit(record)
+    manifest.save()
+    return exit_code
+
+
+def _failed(record):
+    return "error" in record or any(s["text"].startswith("[!]") for s in record["suggestions"])
+
+
+def _analyze_all(paths, jobs=None, chunksize=16):
+    """Yields one record per path, from a process pool when there are several."""
+    if jobs == 1 or len(paths) <= 1:
+        analyzer = PromptAnalyzer()
+        for path in paths:
+            yield analyze_file(path, analyzer)
+        return
+
+    with Pool(processes=jobs, initializer=_init_worker) as pool:
+        # Unordered so a slow file never holds back the stream
+        yield from pool.imap_unordered(analyze_file, paths, chunksize=chunksize)
+
+
+# --- Lint manifest ---
+
+def ruleset_version():
+    """Digest of everything a lint record depends on besides the file itself."""
+    import analyzer
+    import matcher
+    import rules
+    import spans
+    import stream
+    import structure
+    import tokens
+    from prompt_data import (PROMPT_ELEMENTS, PROMPT_TECHNIQUES_DATA, GENERAL_TIPS, SUGGESTION_RULES,
+                             TECHNIQUE_RULES, MAX_SUGGESTIONS)
+
+    data = [MANIFEST_VERSION, STREAM_THRESHOLD_BYTES, PROMPT_ELEMENTS, PROMPT_TECHNIQUES_DATA, GENERAL_TIPS,
+            SUGGESTION_RULES, TECHNIQUE_RULES, MAX_SUGGESTIONS, analyzer.SUGGESTION_PATTERNS,
+            structure.SECTION_PATTERNS, os.environ.get(tokens.VOCAB_ENV)]
+    digest = hashlib.blake2b(json.dumps(data, sort_keys=True).encode("utf-8"), digest_size=16)
+    # The matching and rule code can change results as much as the tables can
+    for module in (analyzer, matcher, rules, spans, stream, structure, tokens, sys.modules[__name__]):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LintManifest:
+    """Lint results of unchanged files, kept in a JSON file between runs.
+
+    Files are keyed by their path relative to the linted directory, so a
+    manifest stays valid when the repository is checked out elsewhere (e.g.
+    a CI cache). With path=None the manifest only lives in memory.
+    """
+
+    def __init__(self, path=None, version=None):
+        self.path = path
+        self.version = version or ruleset_version()
+        self.files = {} # relative path -> {"mtime_ns", "size", "hash", "record"}
+        if path is None:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return # Missing or unreadable: start empty
+        if isinstance(data, dict) and data.get("version") == self.version:
+            self.files = data.get("files", {})
+
+    def check(self, key, path):
+        """Returns (cached record or None, fingerprint of the file as it is now)."""
+        stat = os.stat(path)
+        entry = self.files.get(key)
+        fingerprint = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": None}
+        if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["record"], dict(fingerprint, hash=entry["hash"])
+        fingerprint["hash"] = _file_digest(path) # Touched or checked out again: compare contents
+        if entry is not None and entry["hash"] == fingerprint["hash"]:
+            entry.update(fingerprint) # Same content; skip the hash next time
+            return entry["record"], fingerprint
+        return None, fingerprint
+
+    def store(self, key, fingerprint, record):
+        if "error" in record:
+            self.files.pop(key, None) # Unreadable files are retried every run
+        else:
+            self.files[key] = dict(fingerprint, record=record)
+
+    def prune(self, keys):
+        """Forgets files that are not in keys; returns the removed keys."""
+        removed = [key for key in self.files if key not in keys]
+        for key in removed:
+            del self.files[key]
+        return removed
+
+    def save(self):
+        if self.path is None:
+            return
+        data = {"version": self.version, "files": self.files}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path) # Never leave a half-written manifest behind
+
+
+def lint_with_manifest(directory, paths, manifest, jobs=None, chunksize=16):
+    """Yields (record, cached) for every path, analysing only files whose content changed.
+
+    Files not in paths are dropped from the manifest.
+    """
+    keys = {}
+    stale, fingerprints = [], {}
+    for path in paths:
+        key = keys[path] = os.path.relpath(path, directory)
+        try:
+            record, fingerprint = manifest.check(key, path)
+        except OSError:
+            stale.append(path) # analyze_file reports the error
+            continue
+        if record is not None:
+            yield dict(record, path=path), True
+        else:
+            stale.append(path)
+            fingerprints[path] = fingerprint
+    for record in _analyze_all(stale, jobs, chunksize):
+        path = record["path"]
+        if path in fingerprints:
+            manifest.store(keys[path], fingerprints[path], record)
+        yield record, False
+    manifest.prune(set(keys.values()))
+
+
+def _snapshot(directory, extensions):
+    snapshot = {}
+    for path in find_prompt_files(directory, extensions):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch_batch(directory, jobs=None, out=None, extensions=DEFAULT_EXTENSIONS, manifest=None,
+                interval=WATCH_INTERVAL, debounce_ms=WATCH_DEBOUNCE_MS, stop=None):
+    """Lints directory, then re-lints changed files until stop (a threading.Event) is set.
+
+    Writes every record on the first run; after that only the records of
+    files that were re-analysed, plus {"path", "removed": true} for deleted
+    files. Like the GUI's schedule_analysis, a burst of changes is linted
+    once, debounce_ms after the last change.
+    """
+    out = out or sys.stdout
+    stop = stop or threading.Event()
+    if not isinstance(manifest, LintManifest):
+        manifest = LintManifest(manifest)
+    snapshot = _snapshot(directory, extensions) # Before linting, so edits made meanwhile are seen
+    run_batch(directory, jobs, out, extensions, manifest=manifest)
+    while not stop.wait(interval):
+        current = _snapshot(directory, extensions)
+        if current == snapshot:
+            continue
+        # Debounce: wait until the tree has been quiet for debounce_ms
+        quiet_since = time.monotonic()
+        while not stop.wait(interval / 5):
+            latest = _snapshot(directory, extensions)
+            if latest != current:
+                current, quiet_since = latest, time.monotonic()
+            elif time.monotonic() - quiet_since >= debounce_ms / 1000:
+                break
+        if stop.is_set():
+            break
+        paths = sorted(current)
+        for record, cached in lint_with_manifest(directory, paths, manifest, jobs):
+            if not cached:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        for path in sorted(set(snapshot) - set(current)):
+            out.write(json.dumps({"path": path, "removed": True}) + "\n")
+        out.flush()
+        manifest.save()
+        snapshot = current
+    return 0
@@ -0,0 +1,70 @@
+"""Benchmark: near-duplicate index build and query time as the corpus grows.
+
+Generates synthetic prompts (a few hundred base prompts, each copied with a
+handful of word edits) and indexes them in memory. Each size reports
+indexing throughput, then the median latency of a near-duplicate query and
+the time to cluster the whole corpus. Query time should stay roughly flat as
+the corpus grows. Run from the repository root:
+
+    python benchmarks/bench_dedup.py
+    python benchmarks/bench_dedup.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import DedupIndex
+
+WORDS = [f"w{i}" for i in range(20_000)] + "the a of to and summarize classify translate report".split()
+PROMPT_WORDS = 150
+QUERIES = 50
+
+
+def make_prompts(count, seed=0):
+    rng = random.Random(seed)
+    bases = [rng.choices(WORDS, k=PROMPT_WORDS) for _ in range(max(1, count // 20))]
+    for _ in range(count):
+        words = list(rng.choice(bases))
+        for _ in range(rng.randrange(5)):
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+        yield " ".join(words)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate index scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000],
+                        help="Corpus sizes to index (default: 1000 10000 50000).")
+    args = parser.parse_args(argv)
+
+    print(f"{'prompts':>9} {'index/s':>9} {'query ms':>9} {'clusters':>9} {'cluster s':>10}")
+    for size in args.sizes:
+        index = DedupIndex(":memory:")
+        prompts = list(make_prompts(size))
+        start = time.perf_counter()
+        with index.db:
+            for i, text in enumerate(prompts):
+                index._add(f"p{i}.txt", text, 0, len(text))
+        rate = size / (time.perf_counter() - start)
+
+        rng = random.Random(1)
+        times = []
+        for _ in range(QUERIES):
+            text = rng.choice(prompts)
+            start = time.perf_counter()
+            index.query(text)
+            times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        clusters = index.clusters()
+        cluster_time = time.perf_counter() - start
+        print(f"{size:>9} {rate:>9.0f} {statistics.median(times) * 1000:>9.2f} {len(clusters):>9} {cluster_time:>10.2f}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
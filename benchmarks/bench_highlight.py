@@ -0,0 +1,72 @@
+"""Benchmark: per-match ``1.0+Nc`` tag_add vs the batched Highlighter.
+
+Needs a display (Tk window is created and withdrawn). Run from the repository root:
+
+    python benchmarks/bench_highlight.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from highlight import Highlighter
+from spans import SpanStore
+
+LINE = "Summarize this ### section and explain the result in markdown.\n" # 4 matches per line
+LEGACY_LIMIT = 20_000 # The legacy path is quadratic; stop measuring it beyond this
+
+
+def build(lines):
+    text = LINE * lines
+    spans = {"Instruction": [], "Delimiter": [], "Output Format": []}
+    for i in range(lines):
+        base = i * len(LINE)
+        spans["Instruction"].append((base, base + 9))
+        spans["Delimiter"].append((base + 15, base + 18))
+        spans["Instruction"].append((base + 31, base + 38))
+        spans["Output Format"].append((base + 53, base + 64))
+    return text, spans
+
+
+def legacy(widget, text, spans):
+    widget.delete("1.0", tk.END)
+    widget.insert("1.0", text)
+    for tag, ranges in spans.items():
+        for start, end in ranges:
+            widget.tag_add(tag, f"1.0+{start}c", f"1.0+{end}c")
+
+
+def batched(widget, text, spans):
+    widget.delete("1.0", tk.END)
+    Highlighter(widget, spans).show(text, SpanStore.from_matches(spans, spans))
+
+
+def timed(func, widget, text, spans):
+    start = time.perf_counter()
+    func(widget, text, spans)
+    widget.update_idletasks()
+    return time.perf_counter() - start
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Tk not available, skipping: {e}")
+        return
+    root.withdraw()
+    widget = tk.Text(root)
+    print(f"{'matches':>8} {'legacy ms':>10} {'batched ms':>11} {'batched us/match':>17}")
+    for lines in (250, 1_000, 5_000, 12_500, 25_000):
+        text, spans = build(lines)
+        count = sum(len(r) for r in spans.values())
+        legacy_ms = f"{timed(legacy, widget, text, spans) * 1000:.1f}" if count <= LEGACY_LIMIT else "-"
+        batched_s = timed(batched, widget, text, spans)
+        print(f"{count:>8} {legacy_ms:>10} {batched_s * 1000:>11.1f} {batched_s / count * 1e6:>17.2f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: per-pattern regex scans vs the single-pass PromptMatcher.
+
+Run from the repository root:
+
+    python benchmarks/bench_matcher.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import DEFAULT_MATCHER, DEFAULT_RULES
+from prompt_data import PROMPT_ELEMENTS
+from synthetic import make_prompt
+
+
+def legacy_scan(prompt):
+    """The previous pipeline: one finditer per element plus separate keyword scans."""
+    spans = []
+    for element, config in PROMPT_ELEMENTS.items():
+        for match in re.finditer(config["keywords_regex"], prompt):
+            spans.append((element, match.start(), match.end()))
+    re.search(r'(?i)\b(context:|based on)\b.*\b(question:|what is|how does)\b', prompt, re.DOTALL)
+    re.search(r'\b(not|don\'t|never|avoid|without)\b', prompt, re.IGNORECASE)
+    prompt_lower = prompt.lower()
+    re.search(r'\b(calculate|math|logic|reason|solve)\b', prompt_lower)
+    [keyword in prompt_lower for keyword in DEFAULT_RULES.keywords()]
+    return spans
+
+
+def single_pass(prompt):
+    return DEFAULT_MATCHER.find_all(prompt)
+
+
+def best_of(func, prompt, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(prompt)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'size':>10} {'legacy ms':>10} {'single ms':>10} {'speedup':>8}")
+    for size in (100_000, 250_000, 1_000_000):
+        prompt = make_prompt(size)
+        legacy = best_of(legacy_scan, prompt)
+        single = best_of(single_pass, prompt)
+        print(f"{size:>10} {legacy * 1000:>10.1f} {single * 1000:>10.1f} {legacy / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
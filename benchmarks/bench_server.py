@@ -0,0 +1,74 @@
+"""Benchmark: round-trip latency of the analysis server vs calling the analyzer directly.
+
+Starts server.py on a temporary Unix socket and sends analyze requests from one
+client. Run from the repository root:
+
+    python benchmarks/bench_server.py
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analyzer import PromptAnalyzer
+
+PROMPTS = {
+    "short": "You are an expert editor. Summarize the following text in 3 bullet points.",
+    "medium": "Context: the quarterly report.\nQuestion: what changed?\n### Example 1:\nInput: a\nOutput: b\n" * 40,
+}
+REQUESTS = 2000
+
+
+class Client:
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX)
+        self.sock.connect(path)
+        self.file = self.sock.makefile("rb")
+        self.next_id = 0
+
+    def request(self, method, params):
+        self.next_id += 1
+        data = json.dumps({"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params}).encode()
+        self.sock.sendall(b"Content-Length: %d\r\n\r\n" % len(data) + data)
+        length = None
+        while True:
+            line = self.file.readline().strip()
+            if not line:
+                break
+            length = int(line.split(b":")[1])
+        return json.loads(self.file.read(length))
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "server.py"), "--socket", path],
+                              stderr=subprocess.PIPE)
+    server.stderr.readline() # "Listening on ..."
+    try:
+        client = Client(path)
+        analyzer = PromptAnalyzer()
+        print(f"{'prompt':>8} {'round trip us':>14} {'direct us':>10} {'overhead us':>12}")
+        for name, prompt in PROMPTS.items():
+            client.request("prompt/analyze", {"text": prompt}) # Warm up
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                client.request("prompt/analyze", {"text": prompt})
+            round_trip = (time.perf_counter() - start) / REQUESTS
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                analyzer.analyze(prompt).to_dict()
+            direct = (time.perf_counter() - start) / REQUESTS
+            print(f"{name:>8} {round_trip * 1e6:>14.0f} {direct * 1e6:>10.0f} {(round_trip - direct) * 1e6:>12.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: cold-start time of the CLI and the GUI window.
+
+Every measurement is a fresh interpreter, timed from launch to exit, so it
+includes interpreter startup and imports. "cold" runs use an empty pattern
+cache directory (the first run after install), "warm" runs reuse one. The GUI
+row opens the real main window with --startup-probe, which exits as soon as
+the window is first drawn; it is skipped without a display. Run from the
+repository root:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = "You are an expert editor.\nSummarize the following text in 3 bullet points.\n"
+
+# name -> command line; "{sample}" is replaced by the path of a small prompt file
+COMMANDS = {
+    "python": [sys.executable, "-c", "pass"], # Interpreter startup alone, for reference
+    "import prompt_data": [sys.executable, "-c", "import prompt_data"],
+    "import analyzer": [sys.executable, "-c", "import analyzer"],
+    "first analyze()": [sys.executable, "-c", "import analyzer; analyzer.analyze('Summarize this.')"],
+    "cli --analyze-file": [sys.executable, "main.py", "--analyze-file", "{sample}"],
+    "gui first frame": [sys.executable, "main.py", "--startup-probe"],
+}
+
+
+def has_display():
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def run_once(command, env):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def measure(command, runs, cold):
+    """Median wall time in seconds; cold runs get a fresh cache directory each time."""
+    times = []
+    cache = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, PROMPT_BUILDER_CACHE=cache)
+        run_once(command, env) # Fills the cache (warm) and the OS file cache (both)
+        for _ in range(runs):
+            if cold:
+                shutil.rmtree(cache, ignore_errors=True)
+            times.append(run_once(command, env))
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start time of the CLI and GUI")
+    parser.add_argument("--runs", type=int, default=10, help="Launches per measurement (default: 10).")
+    args = parser.parse_args(argv)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write(SAMPLE)
+    try:
+        print(f"{'command':>20} {'cold ms':>9} {'warm ms':>9}")
+        for name, command in COMMANDS.items():
+            if "--startup-probe" in command and not has_display():
+                print(f"{name:>20}   skipped (no display)")
+                continue
+            command = [part.replace("{sample}", f.name) for part in command]
+            cold = measure(command, args.runs, cold=True)
+            warm = measure(command, args.runs, cold=False)
+            print(f"{name:>20} {cold * 1000:>9.1f} {warm * 1000:>9.1f}")
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
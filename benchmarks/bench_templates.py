@@ -0,0 +1,64 @@
+"""Benchmark: search-as-you-type latency of the template library.
+
+Builds a temporary library of synthetic templates (names, descriptions and use
+cases drawn from a small vocabulary, so common words match thousands of rows)
+and times every prefix of a few queries, as typed one key at a time. Run from
+the repository root:
+
+    python benchmarks/bench_templates.py
+    python benchmarks/bench_templates.py --count 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import TemplateStore
+
+VOCABULARY = ("summarize translate classify extract review legal finance medical code email report "
+              "customer support sales onboarding incident contract invoice policy research").split()
+QUERIES = ("legal contract", "summ", "customer support email", "template 12345", "invoice")
+
+
+def make_templates(count, seed=0):
+    rng = random.Random(seed)
+    return [{"name": f"{rng.choice(VOCABULARY).title()} {rng.choice(VOCABULARY)} template {i}",
+             "description": " ".join(rng.choices(VOCABULARY, k=10)),
+             "use_case": " ".join(rng.choices(VOCABULARY, k=8)),
+             "template": f"Instruction: {' '.join(rng.choices(VOCABULARY, k=20))}"} for i in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Template search latency")
+    parser.add_argument("--count", type=int, default=20_000, help="Templates in the library (default: 20000).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "templates.db")
+        store = TemplateStore(path)
+        start = time.perf_counter()
+        store.add(make_templates(args.count))
+        print(f"import {args.count} templates: {(time.perf_counter() - start) * 1000:.0f} ms (fts5: {store.fts})")
+        store.close()
+
+        start = time.perf_counter()
+        store = TemplateStore(path)
+        print(f"open library: {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"{'query':>24} {'median ms':>10} {'max ms':>8}")
+        for query in QUERIES:
+            times = []
+            for end in range(1, len(query) + 1): # One search per keystroke
+                start = time.perf_counter()
+                store.search(query[:end])
+                times.append(time.perf_counter() - start)
+            print(f"{query:>24} {statistics.median(times) * 1000:>10.2f} {max(times) * 1000:>8.2f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
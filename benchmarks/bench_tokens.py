@@ -0,0 +1,114 @@
+"""Benchmark: token estimation speed, keystroke latency and accuracy.
+
+Times a cold count (empty memo) and a warm recount of synthetic prompts built
+from the bundled templates, and the incremental update after a one-character
+edit, as the GUI does on every keystroke. It then reports the error of the
+default (vocab-free) estimate on token_reference.json, a small set of prompts
+with their exact cl100k_base counts. With --vocab (a tiktoken-format BPE file
+such as cl100k_base.tiktoken) it also reports the vocab's error on that set and
+how far the heuristic is from the exact count of the templates and a large
+prompt. Run from the repository root:
+
+    python benchmarks/bench_tokens.py
+    python benchmarks/bench_tokens.py --vocab cl100k_base.tiktoken
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental import edit_bounds
+from prompt_data import PROMPT_TECHNIQUES_DATA
+from synthetic import make_prompt
+from tokens import IncrementalTokenCounter, TokenEstimator
+
+SIZES = (10_000, 100_000, 1_000_000) # Characters per synthetic prompt
+EDITS = 50 # Keystrokes timed per size
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "token_reference.json")
+
+
+def time_estimator(estimator, label):
+    print(f"{label}")
+    print(f"{'chars':>10} {'tokens':>9} {'cold ms':>9} {'warm ms':>9} {'keystroke ms':>13}")
+    for size in SIZES:
+        prompt = make_prompt(size, template_ratio=1.0)
+        estimator._blocks.clear()
+        estimator._pieces.clear()
+        start = time.perf_counter()
+        tokens = estimator.count(prompt)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        estimator.count(prompt)
+        warm = time.perf_counter() - start
+
+        counter = IncrementalTokenCounter(estimator)
+        counter.update(prompt, (0, 0, len(prompt)))
+        rng = random.Random(1)
+        times = []
+        for _ in range(EDITS):
+            pos = rng.randrange(len(prompt))
+            edited = prompt[:pos] + rng.choice("abc \n") + prompt[pos:]
+            bounds = edit_bounds(prompt, edited) # The analyzer has these already; not timed
+            start = time.perf_counter()
+            counter.update(edited, bounds)
+            times.append(time.perf_counter() - start)
+            prompt = edited
+        print(f"{size:>10} {tokens:>9} {cold * 1000:>9.1f} {warm * 1000:>9.2f} {statistics.median(times) * 1000:>13.3f}")
+
+
+def reference(estimator, label):
+    """Error of estimator on each reference sample and on the whole set."""
+    with open(REFERENCE, encoding="utf-8") as f:
+        data = json.load(f)
+    print(f"\n{label} vs exact {data['encoding']} counts ({os.path.basename(REFERENCE)})")
+    print(f"{'sample':<18} {'exact':>6} {'estimate':>9} {'error':>8}")
+    errors, exact_total, estimate_total = [], 0, 0
+    for sample in data["samples"]:
+        estimate = estimator.count(sample["text"])
+        error = (estimate - sample["tokens"]) / sample["tokens"]
+        errors.append(error)
+        exact_total += sample["tokens"]
+        estimate_total += estimate
+        print(f"{sample['name']:<18} {sample['tokens']:>6} {estimate:>9} {error:>+8.1%}")
+    print(f"{'total':<18} {exact_total:>6} {estimate_total:>9} {(estimate_total - exact_total) / exact_total:>+8.1%}"
+          f"  (median |error| {statistics.median(map(abs, errors)):.1%})")
+
+
+def compare(exact, heuristic):
+    """Relative error of the heuristic per template and on a large prompt."""
+    errors = []
+    for entry in PROMPT_TECHNIQUES_DATA.values():
+        text = entry["template"]
+        truth = exact.count(text)
+        if truth:
+            errors.append((heuristic.count(text) - truth) / truth)
+    prompt = make_prompt(SIZES[-1], template_ratio=1.0)
+    truth = exact.count(prompt)
+    print(f"heuristic vs vocab: median |error| per template {statistics.median(map(abs, errors)):.1%}, "
+          f"worst {max(errors, key=abs):+.1%}; 1M-char prompt {(heuristic.count(prompt) - truth) / truth:+.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Token estimation speed and accuracy")
+    parser.add_argument("--vocab", metavar="FILE", help="tiktoken-format BPE file for exact counts.")
+    args = parser.parse_args(argv)
+
+    heuristic = TokenEstimator()
+    time_estimator(heuristic, "heuristic (no vocab)")
+    reference(heuristic, "heuristic (no vocab)")
+    if args.vocab:
+        start = time.perf_counter()
+        exact = TokenEstimator(args.vocab)
+        print(f"\nload vocab: {(time.perf_counter() - start) * 1000:.0f} ms")
+        time_estimator(exact, f"BPE ({os.path.basename(args.vocab)})")
+        reference(exact, f"BPE ({os.path.basename(args.vocab)})")
+        compare(exact, heuristic)
+
+
+if __name__ == "__main__":
+    main()
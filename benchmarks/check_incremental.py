@@ -0,0 +1,64 @@
+"""Equivalence check: IncrementalAnalyzer.update vs a fresh PromptAnalyzer.analyze.
+
+Applies random edit sequences (insertions, deletions, replacements, pastes
+of whole lines, occasional undo to an earlier text so the analysis cache is
+hit) and compares spans, found elements, analysis details and suggestions
+after every edit. Exits with status 1 on the first mismatch. Run from the
+repository root:
+
+    python benchmarks/check_incremental.py
+    python benchmarks/check_incremental.py --sequences 500 --edits 100
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import PromptAnalyzer
+from cache import AnalysisCache
+from incremental import IncrementalAnalyzer
+from synthetic import fuzz_pieces, random_text
+
+
+def summary(result):
+    return (list(result.spans), sorted(result.found_elements), result.analysis_details, result.suggestions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IncrementalAnalyzer vs full analysis")
+    parser.add_argument("--sequences", type=int, default=200, help="Edit sequences (default: 200).")
+    parser.add_argument("--edits", type=int, default=50, help="Edits per sequence (default: 50).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    analyzer = PromptAnalyzer()
+    pieces = fuzz_pieces(analyzer.matcher)
+    rng = random.Random(args.seed)
+    for sequence in range(args.sequences):
+        cache = AnalysisCache(max_bytes=1 << 20) if sequence % 2 else None
+        incremental = IncrementalAnalyzer(analyzer, overlap=rng.choice([0, 8, 64]), cache=cache)
+        text, history = random_text(rng, pieces, 60), []
+        for edit in range(args.edits):
+            history.append(text)
+            if rng.random() < 0.1:
+                text = rng.choice(history) # Undo/redo
+            else:
+                start = rng.randrange(len(text) + 1)
+                end = min(len(text), start + rng.choice([0, 0, 1, 5, 40]))
+                text = text[:start] + random_text(rng, pieces, rng.choice([0, 1, 3])) + text[end:]
+            got = summary(incremental.update(text))
+            expected = summary(analyzer.analyze(text))
+            if got != expected:
+                print(f"MISMATCH sequence {sequence} edit {edit}: previous={history[-1]!r}\n  text={text!r}")
+                for label, a, b in zip(("spans", "elements", "details", "suggestions"), got, expected):
+                    if a != b:
+                        print(f"  {label}: incremental={a!r}\n  {' ' * len(label)}  full={b!r}")
+                return 1
+    print(f"ok: {args.sequences} sequences of {args.edits} edits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Equivalence check: the single-pass PromptMatcher vs one re.finditer per pattern.
+
+Scans random texts dense in element keywords, each with random pos/endpos,
+and compares every pattern's matches with those of its own compiled regex.
+Exits with status 1 and prints the first counterexample on a mismatch. Run
+from the repository root:
+
+    python benchmarks/check_matcher.py
+    python benchmarks/check_matcher.py --cases 100000 --seed 3
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import default_matcher
+from synthetic import fuzz_pieces, random_text
+
+
+def reference(matcher, text, start, end):
+    return {name: [(m.start(), m.end()) for m in matcher.compiled[name].finditer(text, start, end)]
+            for name in matcher.names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PromptMatcher vs per-pattern re.finditer")
+    parser.add_argument("--cases", type=int, default=20_000, help="Random texts to check (default: 20000).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    matcher = default_matcher()
+    pieces = fuzz_pieces(matcher)
+    rng = random.Random(args.seed)
+    for case in range(args.cases):
+        text = random_text(rng, pieces)
+        start, end = 0, len(text)
+        if text and rng.random() < 0.5:
+            start = rng.randrange(len(text) + 1)
+            end = rng.randrange(start, len(text) + 1)
+        got = matcher.find_all(text, start, end)
+        expected = reference(matcher, text, start, end)
+        if got != expected:
+            diff = {name: (got[name], expected[name]) for name in matcher.names if got[name] != expected[name]}
+            print(f"MISMATCH case {case}: text={text!r} pos={start} endpos={end}\n  (matcher, re) = {diff}")
+            return 1
+    print(f"ok: {args.cases} texts, {len(matcher.names)} patterns (line_local={matcher.line_local})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Equivalence check: chunked stream.analyze_path vs analysing the whole file at once.
+
+Writes random files (with and without line breaks, so chunks are also cut
+inside lines and inside matches) and streams them with tiny chunk sizes.
+Element counts, found elements, analysis details and suggestions must equal
+a full analysis of the same text, and the token count must equal counting
+the whole text. Exits with status 1 on the first mismatch. Run from the
+repository root:
+
+    python benchmarks/check_stream.py
+    python benchmarks/check_stream.py --cases 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import PromptAnalyzer
+from stream import analyze_path
+from synthetic import fuzz_pieces, random_text
+
+CHUNK_SIZES = (1, 2, 3, 4, 5, 7, 16, 64, 1 << 20)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chunked streaming vs full analysis")
+    parser.add_argument("--cases", type=int, default=1_000, help="Random files to check (default: 1000).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    analyzer = PromptAnalyzer()
+    pieces = fuzz_pieces(analyzer.matcher)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prompt.txt")
+        for case in range(args.cases):
+            text = random_text(rng, pieces, 60)
+            if rng.random() < 0.3:
+                text = text.replace("\n", " ") # One long line: chunks are cut mid-line
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            full = analyzer.analyze(text.strip())
+            expected_counts = {}
+            for element, _, _ in full.spans:
+                expected_counts[element] = expected_counts.get(element, 0) + 1
+            expected_details = dict(full.analysis_details, tokens=analyzer.tokens.count(text))
+            chunk_bytes = rng.choice(CHUNK_SIZES)
+            got = analyze_path(path, analyzer, chunk_bytes=chunk_bytes, overlap=rng.choice([64, 4096]))
+            checks = (("counts", got.counts, expected_counts),
+                      ("found_elements", got.found_elements, full.found_elements),
+                      ("analysis_details", got.analysis_details, expected_details),
+                      ("suggestions", got.suggestions, full.suggestions))
+            for label, a, b in checks:
+                if a != b:
+                    print(f"MISMATCH case {case} chunk_bytes={chunk_bytes}: text={text!r}\n"
+                          f"  {label}: stream={a!r}\n  {' ' * len(label)}    full={b!r}")
+                    return 1
+    print(f"ok: {args.cases} files, chunk sizes {', '.join(map(str, CHUNK_SIZES))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Reproducible throughput/latency suite for the analysis pipeline.
+
+For each synthetic prompt size it measures full analysis latency, scan
+throughput (spans/sec), suggestion time, the latency of a one-character
+incremental edit, peak memory of an analysis and the cost of pushing the
+result into a text widget. Results are written as JSON and can be checked
+against regression thresholds. Run from the repository root:
+
+    python benchmarks/run_suite.py --out results.json
+    python benchmarks/run_suite.py --sizes 1KB,100KB,1MB --check benchmarks/thresholds.json
+    python benchmarks/run_suite.py --baseline old.json --tolerance 0.25
+
+Widget cost is measured headlessly against a widget that accepts the same Tcl
+calls as tk.Text but discards them (the Python-side cost of a refresh); pass
+--tk to use a real, withdrawn Tk window instead when a display is available.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import PromptAnalyzer
+from highlight import Highlighter, LineIndex
+from incremental import IncrementalAnalyzer
+from prompt_data import PROMPT_ELEMENTS
+from synthetic import SIZES, make_prompt, parse_size
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = "1KB,10KB,100KB,1MB,10MB"
+TARGET_SECONDS = 0.5 # Per metric; small prompts are repeated until this is reached
+BASELINE_FLOOR = 0.5 # ms (or MB); smaller absolute differences from a baseline are noise
+
+
+class _NullTk:
+    def __init__(self):
+        self.calls = 0
+        self.arguments = 0
+
+    def call(self, *args):
+        self.calls += 1
+        self.arguments += len(args)
+
+
+class NullText:
+    """Stands in for tk.Text: accepts the calls Highlighter makes and drops them.
+
+    The view is the first VISIBLE_LINES lines, as in a freshly opened window.
+    """
+
+    _w = ".null"
+    VISIBLE_LINES = 40
+
+    def __init__(self):
+        self.tk = _NullTk()
+
+    def index(self, index):
+        return "1.0" if index == "@0,0" else f"{self.VISIBLE_LINES}.0"
+
+    def winfo_height(self):
+        return 600
+
+    def delete(self, start, end):
+        pass
+
+    def insert(self, index, chars, tags=()):
+        pass
+
+
+def measure(func, min_runs=3, max_runs=200):
+    """Median wall time of func() in seconds, repeating small workloads for stability."""
+    times = []
+    deadline = time.perf_counter() + TARGET_SECONDS
+    while len(times) < min_runs or (len(times) < max_runs and time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def peak_memory(func):
+    """Peak bytes allocated by func() on top of what was already live."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def make_widget(use_tk):
+    if not use_tk:
+        return NullText(), None
+    import tkinter as tk
+    root = tk.Tk()
+    root.withdraw()
+    widget = tk.Text(root)
+    for element, config in PROMPT_ELEMENTS.items():
+        widget.tag_configure(element, background=config["color"])
+    return widget, root
+
+
+def bench_size(size, seed, use_tk):
+    prompt = make_prompt(size, seed)
+    analyzer = PromptAnalyzer()
+    result = analyzer.analyze(prompt)
+    span_count = len(result.spans)
+    store = result.store
+
+    analyze_s = measure(lambda: analyzer.analyze(prompt))
+    scan_s = measure(lambda: analyzer.matcher.scan(prompt))
+    suggest_s = measure(lambda: analyzer.suggest(prompt, result.found_elements, result.analysis_details, store.counts()))
+
+    # One character typed in the middle of the prompt, after a warm full analysis
+    middle = len(prompt) // 2
+    edited = prompt[:middle] + "x" + prompt[middle:]
+    incremental = IncrementalAnalyzer(analyzer)
+
+    def edit():
+        incremental.update(prompt)
+        start = time.perf_counter()
+        incremental.update(edited)
+        return time.perf_counter() - start
+
+    edit()
+    edit_s = statistics.median(edit() for _ in range(5))
+
+    # Widget refresh from scratch: line index plus every tag range
+    widget, root = make_widget(use_tk)
+
+    def highlight():
+        if root is not None:
+            widget.delete("1.0", "end")
+        Highlighter(widget, PROMPT_ELEMENTS, analyzer.matcher.line_local).show(prompt, store, LineIndex(prompt))
+        if root is not None:
+            widget.update_idletasks()
+
+    highlight_s = measure(highlight, min_runs=1 if size >= 1_000_000 else 3)
+    if root is not None:
+        root.destroy()
+
+    return {
+        "size": size,
+        "spans": span_count,
+        "analyze_ms": analyze_s * 1000,
+        "scan_ms": scan_s * 1000,
+        "spans_per_sec": span_count / scan_s if scan_s else 0.0,
+        "mb_per_sec": size / 1_000_000 / scan_s if scan_s else 0.0,
+        "suggest_ms": suggest_s * 1000,
+        "edit_ms": edit_s * 1000,
+        "highlight_ms": highlight_s * 1000,
+        "highlight_spans_per_sec": span_count / highlight_s if highlight_s else 0.0,
+        "peak_mb": peak_memory(lambda: analyzer.analyze(prompt)) / 1_000_000,
+    }
+
+
+def check_thresholds(results, thresholds):
+    """Returns a list of human-readable failures for absolute limits.
+
+    thresholds: {metric: {"max": value, "per_mb": bool, "min_size": chars}}; with
+    per_mb the limit scales with prompt size (e.g. milliseconds per megabyte).
+    """
+    failures = []
+    for row in results:
+        for metric, limit in thresholds.items():
+            if metric not in row or row["size"] < limit.get("min_size", 0):
+                continue
+            scale = row["size"] / 1_000_000 if limit.get("per_mb") else 1
+            if "max" in limit and row[metric] > limit["max"] * scale:
+                failures.append(f"{metric} at {row['size']} chars: {row[metric]:.2f} > {limit['max'] * scale:.2f}")
+            if "min" in limit and row[metric] < limit["min"] * scale:
+                failures.append(f"{metric} at {row['size']} chars: {row[metric]:.2f} < {limit['min'] * scale:.2f}")
+    return failures
+
+
+def check_baseline(results, baseline, tolerance):
+    """Flags time metrics more than `tolerance` slower than a previous run of the same size."""
+    previous = {row["size"]: row for row in baseline["results"]}
+    failures = []
+    for row in results:
+        old = previous.get(row["size"])
+        if old is None:
+            continue
+        for metric in ("analyze_ms", "scan_ms", "suggest_ms", "edit_ms", "highlight_ms", "peak_mb"):
+            if (old.get(metric) and row[metric] > old[metric] * (1 + tolerance)
+                    and row[metric] - old[metric] > BASELINE_FLOOR):
+                failures.append(f"{metric} at {row['size']} chars: {row[metric]:.2f} vs baseline {old[metric]:.2f}"
+                                f" (+{row[metric] / old[metric] - 1:.0%})")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analysis throughput and latency benchmarks")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated prompt sizes, e.g. 1KB,250KB,1MB (default: {DEFAULT_SIZES}).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic prompt generator.")
+    parser.add_argument("--out", metavar="FILE", help="Write JSON results to FILE (default: stdout).")
+    parser.add_argument("--check", metavar="FILE", help="Fail (exit 1) if any absolute threshold in FILE is exceeded.")
+    parser.add_argument("--baseline", metavar="FILE", help="Fail (exit 1) on regressions against a previous JSON result.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against --baseline as a fraction (default: 0.25).")
+    parser.add_argument("--tk", action="store_true", help="Measure widget updates on a real Tk Text widget.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [SIZES.get(size.strip().upper()) or parse_size(size) for size in args.sizes.split(",")]
+    results = []
+    for size in sizes:
+        row = bench_size(size, args.seed, args.tk)
+        results.append(row)
+        print(f"{size:>10} chars  analyze {row['analyze_ms']:9.2f} ms  scan {row['mb_per_sec']:6.2f} MB/s"
+              f"  edit {row['edit_ms']:8.2f} ms  highlight {row['highlight_ms']:9.2f} ms"
+              f"  peak {row['peak_mb']:7.1f} MB", file=sys.stderr)
+
+    failures = []
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            failures += check_thresholds(results, json.load(f))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failures += check_baseline(results, json.load(f), args.tolerance)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "widget": "tk" if args.tk else "null",
+        "results": results,
+        "failures": failures,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
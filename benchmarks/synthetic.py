@@ -0,0 +1,63 @@
+"""Deterministic synthetic prompts for the benchmarks.
+
+Prompts are built from the PROMPT_TECHNIQUES_DATA templates interleaved with
+filler prose, so every element and structure detector has something to find
+at a realistic density. The same (size, seed) always yields the same text.
+"""
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_data import PROMPT_TECHNIQUES_DATA
+
+FILLER_WORDS = ("the report covers quarterly revenue growth across regions and notes that customer "
+                "retention improved while support costs fell sharply during the period").split()
+SIZES = {"1KB": 1_000, "10KB": 10_000, "100KB": 100_000, "1MB": 1_000_000, "10MB": 10_000_000}
+
+
+def make_prompt(size, seed=0, template_ratio=0.1):
+    """Builds a prompt of exactly `size` characters from templates and filler prose."""
+    rng = random.Random(seed)
+    templates = [data["template"] for data in PROMPT_TECHNIQUES_DATA.values()]
+    parts, total = [], 0
+    while total < size:
+        part = rng.choice(templates) if rng.random() < template_ratio else " ".join(rng.choice(FILLER_WORDS) for _ in range(60))
+        parts.append(part)
+        total += len(part) + 2
+    return "\n\n".join(parts)[:size]
+
+
+def fuzz_pieces(matcher):
+    """Text fragments for randomized equivalence checks: the literal-ish alternatives of every
+    pattern (so matches are dense), plus case-folding, punctuation and line-break edge cases."""
+    pieces = []
+    for name in matcher.names:
+        source = re.sub(r"\(\?[a-zA-Z]+\)|\\b|[()^$?*+]", "", matcher.compiled[name].pattern)
+        for alternative in source.split("|"):
+            alternative = (alternative.replace("\\'", "'").replace("\\d", "3").replace("\\.", ".")
+                           .replace("\\s", " ").replace("\\w", "w").replace("\\", ""))
+            if alternative and "[" not in alternative and "{" not in alternative:
+                pieces.append(alternative)
+    pieces += ["[name]", "{{slot}}", "{var}", "<<x>>", "#####", "-----", "```", "Example 1:", "Input: x",
+               "Output: y", "Thought: a", "Action: b", "Observation: c", "Context:", "Question: what is",
+               "ſummarize", "KELVIN", "ı", "é", "日本", "x", "1:", "e.g.:", "don't", "not", "\t"]
+    return pieces
+
+
+def random_text(rng, pieces, max_pieces=30):
+    """Random text of up to max_pieces fragments joined by spaces, newlines and punctuation."""
+    text = "".join(rng.choice(pieces) + rng.choice(["", " ", "  ", "\n", "\n\n", ":", "x", "-"])
+                   for _ in range(rng.randint(0, max_pieces)))
+    return text.upper() if rng.random() < 0.2 else text
+
+
+def parse_size(text):
+    """Parses "250KB", "1MB" or a plain character count."""
+    text = text.strip().upper()
+    for suffix, factor in (("MB", 1_000_000), ("KB", 1_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
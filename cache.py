@@ -0,0 +1,91 @@
+"""Content-addressed LRU cache of analysis results.
+
+Entries are keyed by a hash of the prompt text, so undo/redo, switching
+templates or retyping earlier text reuses the previous analysis instead of
+rescanning. The cache is bounded by an approximate memory cap.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+ANALYSIS_CACHE_MB = 64 # Default memory cap for cached analysis results
+_ENTRY_BYTES = 512 # Fixed overhead per entry (key, dicts, bookkeeping)
+
+
+def prompt_key(prompt):
+    """Stable content hash of a prompt."""
+    return hashlib.blake2b(prompt.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class CachedAnalysis:
+    """Everything needed to rebuild an analysis result without rescanning."""
+
+    __slots__ = ("store", "found_elements", "analysis_details", "suggestions", "word_count", "size")
+
+    def __init__(self, store, found_elements, analysis_details, suggestions, word_count):
+        self.store = store # SpanStore; stores are never mutated, only replaced
+        self.found_elements = frozenset(found_elements)
+        self.analysis_details = dict(analysis_details)
+        self.suggestions = tuple(suggestions)
+        self.word_count = word_count
+        self.size = (_ENTRY_BYTES
+                     + store.nbytes
+                     + sum(len(text) + len(detail) for text, detail in suggestions))
+
+
+class AnalysisCache:
+    """Thread-safe LRU of CachedAnalysis entries with a memory cap in bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the CachedAnalysis for key (marking it recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Stores entry, evicting least recently used entries to stay under the cap."""
+        if entry.size > self.max_bytes:
+            return # Would evict everything else and still not fit
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.size
+            self._entries[key] = entry
+            self.current_bytes += entry.size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and memory use, e.g. for a status bar or logs."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
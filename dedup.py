@@ -0,0 +1,352 @@
+"""Near-duplicate detection across a prompt corpus (MinHash + LSH).
+
+Each prompt is reduced to the set of its word 3-grams (case-folded, so
+whitespace, punctuation and capitalisation do not matter) and summarised by a
+MinHash signature. To hash each 3-gram once rather than NUM_PERM times, the
+signature uses one-permutation hashing: a 3-gram's hash picks one of NUM_PERM
+bins and each bin keeps its smallest value; empty bins borrow from the next
+filled bin (densification by rotation). The fraction of equal signature
+entries estimates the Jaccard similarity of two prompts. Signatures are cut into BANDS bands; prompts that
+agree on a whole band land in the same LSH bucket, so a query only compares
+against the prompts it shares a bucket with instead of the whole corpus.
+
+Optionally the variable regions found by layout.py (Input Data and Context
+after their labels, and template slots) are dropped first, so prompts that
+only differ in their per-request data count as duplicates.
+
+The index lives in SQLite. ingest() only rehashes files whose size or
+modification time changed and forgets files that were deleted.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from array import array
+from operator import eq
+
+from prompt_data import PROMPT_TECHNIQUES_DATA
+
+SCHEMA_VERSION = 1
+NUM_PERM = 128 # MinHash functions per signature
+BANDS = 16 # LSH bands of NUM_PERM // BANDS rows; candidates share at least one whole band
+SHINGLE_WORDS = 3 # Words per shingle
+THRESHOLD = 0.8 # Estimated Jaccard similarity for two prompts to count as near-duplicates
+COMMIT_EVERY = 500 # Files indexed per transaction during ingest()
+WORD_RE = re.compile(r"[^\W_]+")
+_HASH_MASK = 0xFFFFFFFF # Signature entries are stored as 32-bit values
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    template TEXT,
+    template_similarity REAL
+);
+CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, doc INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS bands_bucket ON bands (band, bucket);
+CREATE INDEX IF NOT EXISTS bands_doc ON bands (doc);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _masks(count):
+    """Fixed pseudo-random 32-bit masks; a value borrowed from d bins away is XORed with mask d."""
+    return [int.from_bytes(hashlib.blake2b(b"minhash-%d" % i, digest_size=4).digest(), "little")
+            for i in range(count)]
+
+
+_MASKS = _masks(NUM_PERM)
+_BIN_BITS = (NUM_PERM - 1).bit_length() # Low hash bits that pick the bin
+
+
+def default_index_path(directory):
+    """Index file for a corpus directory, under the cache directory."""
+    from matcher import cache_dir
+
+    key = hashlib.blake2b(os.path.abspath(directory).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(cache_dir(), f"dedup-{key}.db")
+
+
+def dedup_text(prompt, analyzer=None, exclude_variable=False):
+    """The text that is compared: the prompt, or only its static parts."""
+    if not exclude_variable:
+        return prompt
+    from layout import analyze_layout
+
+    report = analyze_layout(prompt, analyzer=analyzer)
+    return "\n".join(prompt[section.start:section.variable_start] for section in report.sections)
+
+
+def shingles(text, size=SHINGLE_WORDS):
+    """Set of 64-bit hashes of the word n-grams of text (one n-gram if it is shorter)."""
+    words = WORD_RE.findall(text.casefold())
+    if not words:
+        return set()
+    grams = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return {int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+            for gram in grams}
+
+
+def signature(hashes):
+    """MinHash signature (array of NUM_PERM 32-bit values) of a shingle set; None if it is empty."""
+    if not hashes:
+        return None
+    bins = [None] * NUM_PERM
+    for h in hashes:
+        b, value = h % NUM_PERM, (h >> _BIN_BITS) & _HASH_MASK
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+    sig = array("I", bins if None not in bins else [0] * NUM_PERM)
+    if None in bins:
+        for i, value in enumerate(bins):
+            distance = 0
+            while value is None: # Rotate right to the next filled bin; there is always one
+                distance += 1
+                value = bins[(i + distance) % NUM_PERM]
+            sig[i] = value ^ _MASKS[distance] if distance else value
+    return sig
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the prompts behind two signatures."""
+    return sum(map(eq, a, b)) / len(a)
+
+
+def _buckets(sig):
+    """(band, bucket) keys of a signature."""
+    rows = len(sig) // BANDS
+    return [(band, int.from_bytes(hashlib.blake2b(sig[band * rows:(band + 1) * rows].tobytes(),
+                                                  digest_size=8).digest(), "little", signed=True))
+            for band in range(BANDS)]
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent
+        root = item
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while item != root: # Path compression
+            parent[item], item = root, parent.get(item, item)
+        return root
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent.setdefault(min(a, b), min(a, b))
+            self.parent[max(a, b)] = min(a, b) # Lowest id is the root, for stable output
+
+    def groups(self):
+        """{root: [members]} of every item that was ever united with another."""
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return groups
+
+
+class DedupIndex:
+    """Persistent MinHash/LSH index of prompt files."""
+
+    def __init__(self, path=":memory:", exclude_variable=False, threshold=THRESHOLD, analyzer=None,
+                 templates=PROMPT_TECHNIQUES_DATA):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.exclude_variable = exclude_variable
+        self.threshold = threshold
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+        if analyzer is None and exclude_variable:
+            from analyzer import PromptAnalyzer
+            analyzer = PromptAnalyzer()
+        self.analyzer = analyzer
+        # Templates are few, so each prompt is compared with all of them
+        self.templates = []
+        for name, entry in templates.items():
+            sig = signature(shingles(dedup_text(entry["template"], analyzer, exclude_variable)))
+            if sig is not None:
+                self.templates.append((name, sig))
+        self._check_settings(templates)
+
+    def _check_settings(self, templates):
+        """Empties the index if it was built with other parameters or templates."""
+        settings = hashlib.blake2b(json.dumps([SCHEMA_VERSION, NUM_PERM, BANDS, SHINGLE_WORDS, self.exclude_variable,
+                                               sys.byteorder, templates], sort_keys=True).encode("utf-8"),
+                                   digest_size=16).hexdigest()
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+        if row is not None and row[0] == settings:
+            return
+        with self.db:
+            self.db.execute("DELETE FROM bands")
+            self.db.execute("DELETE FROM docs")
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('settings', ?)", (settings,))
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def signature_of(self, text):
+        return signature(shingles(dedup_text(text, self.analyzer, self.exclude_variable)))
+
+    def closest_template(self, sig):
+        """(template name, estimated similarity) of the most similar built-in template, or (None, 0.0)."""
+        best, best_score = None, 0.0
+        if sig is not None:
+            for name, template_sig in self.templates:
+                score = similarity(sig, template_sig)
+                if score > best_score:
+                    best, best_score = name, score
+        return best, best_score
+
+    def add(self, path, text, mtime_ns=0, size=0):
+        """Indexes text under path, replacing any earlier version."""
+        with self.db:
+            self._add(path, text, mtime_ns, size)
+
+    def _add(self, path, text, mtime_ns, size):
+        sig = self.signature_of(text)
+        template, template_score = self.closest_template(sig)
+        self._remove(path)
+        cursor = self.db.execute(
+            "INSERT INTO docs (path, mtime_ns, size, signature, template, template_similarity) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (path, mtime_ns, size, sig.tobytes() if sig is not None else b"", template, template_score))
+        if sig is not None: # Empty prompts are kept but never matched
+            doc = cursor.lastrowid
+            self.db.executemany("INSERT INTO bands (band, bucket, doc) VALUES (?, ?, ?)",
+                                [(band, bucket, doc) for band, bucket in _buckets(sig)])
+
+    def _remove(self, path):
+        row = self.db.execute("SELECT id FROM docs WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            self.db.execute("DELETE FROM bands WHERE doc = ?", row)
+            self.db.execute("DELETE FROM docs WHERE id = ?", row)
+
+    def remove(self, path):
+        with self.db:
+            self._remove(path)
+
+    def _signature(self, blob):
+        sig = array("I")
+        sig.frombytes(blob)
+        return sig
+
+    def query(self, text, threshold=None, limit=20):
+        """Indexed prompts similar to text as [(path, estimated similarity)], most similar first."""
+        threshold = self.threshold if threshold is None else threshold
+        sig = self.signature_of(text)
+        if sig is None:
+            return []
+        matches = []
+        for band, bucket in _buckets(sig):
+            matches.extend(self.db.execute("SELECT doc FROM bands WHERE band = ? AND bucket = ?", (band, bucket)))
+        candidates = {doc for doc, in matches}
+        results = []
+        for doc in candidates:
+            path, blob = self.db.execute("SELECT path, signature FROM docs WHERE id = ?", (doc,)).fetchone()
+            score = similarity(sig, self._signature(blob))
+            if score >= threshold:
+                results.append((path, score))
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit]
+
+    def ingest(self, directory, extensions=None):
+        """Brings the index up to date with the prompt files under directory.
+
+        Paths are stored absolute. Returns {"added", "updated", "unchanged",
+        "removed", "errors"} counts.
+        """
+        from batch import DEFAULT_EXTENSIONS, find_prompt_files
+
+        directory = os.path.abspath(directory)
+        stats = dict.fromkeys(("added", "updated", "unchanged", "removed", "errors"), 0)
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 self.db.execute("SELECT path, mtime_ns, size FROM docs")}
+        seen = set()
+        for path in find_prompt_files(directory, extensions or DEFAULT_EXTENSIONS):
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+                if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    text = f.read().strip()
+            except OSError as e:
+                print(f"Could not read {path}: {e}", file=sys.stderr)
+                stats["errors"] += 1
+                continue
+            self._add(path, text, stat.st_mtime_ns, stat.st_size)
+            stats["updated" if path in known else "added"] += 1
+            if (stats["updated"] + stats["added"]) % COMMIT_EVERY == 0:
+                self.db.commit()
+        prefix = os.path.join(directory, "")
+        for path in known:
+            if path.startswith(prefix) and path not in seen:
+                self._remove(path)
+                stats["removed"] += 1
+        self.db.commit()
+        return stats
+
+    def clusters(self, threshold=None):
+        """Groups of near-duplicate prompts as [[path, ...]], largest first.
+
+        Within each LSH bucket, members are compared with the bucket's first
+        member; pairs it misses are usually joined through another band.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        groups = _UnionFind()
+        signatures = {}
+
+        def sig_of(doc):
+            sig = signatures.get(doc)
+            if sig is None:
+                blob = self.db.execute("SELECT signature FROM docs WHERE id = ?", (doc,)).fetchone()[0]
+                sig = signatures[doc] = self._signature(blob)
+            return sig
+
+        rows = self.db.execute("SELECT group_concat(doc) FROM bands GROUP BY band, bucket HAVING COUNT(*) > 1")
+        for members, in rows:
+            first, *rest = sorted(map(int, members.split(",")))
+            for doc in rest:
+                if groups.find(doc) != groups.find(first) and similarity(sig_of(first), sig_of(doc)) >= threshold:
+                    groups.union(first, doc)
+        paths = dict(self.db.execute("SELECT id, path FROM docs"))
+        result = [sorted(paths[doc] for doc in docs) for docs in groups.groups().values()]
+        result.sort(key=lambda paths: (-len(paths), paths[0]))
+        return result
+
+    def documents(self):
+        """Yields (path, closest template, its estimated similarity) for every indexed prompt."""
+        yield from self.db.execute("SELECT path, template, template_similarity FROM docs ORDER BY path")
+
+    def close(self):
+        self.db.close()
+
+
+def run_dedup(directory, index_path=None, exclude_variable=False, threshold=THRESHOLD, out=None):
+    """Updates the index for directory and writes one JSONL record per prompt plus a final clusters record."""
+    out = out or sys.stdout
+    directory = os.path.abspath(directory)
+    index = DedupIndex(index_path or default_index_path(directory), exclude_variable, threshold)
+    try:
+        stats = index.ingest(directory)
+        clusters = index.clusters()
+        cluster_of = {path: i for i, paths in enumerate(clusters) for path in paths}
+        for path, template, score in index.documents():
+            if not path.startswith(os.path.join(directory, "")):
+                continue
+            record = {"path": path, "template": template, "template_similarity": round(score, 3),
+                      "cluster": cluster_of.get(path)}
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.write(json.dumps({"clusters": clusters, "ingest": stats}, ensure_ascii=False) + "\n")
+    finally:
+        index.close()
+    return 0
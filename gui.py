@@ -0,0 +1,538 @@
+import tkinter as tk
+from tkinter import scrolledtext, Listbox, END, messagebox, Toplevel, filedialog
+from tkinter import ttk  # For Combobox
+import os
+import queue
+import threading
+import time
+
+from prompt_data import PROMPT_ELEMENTS
+from analyzer import PromptAnalyzer
+from cache import ANALYSIS_CACHE_MB, AnalysisCache
+from highlight import Highlighter
+from incremental import IncrementalAnalyzer
+from profiling import PROFILER, stage
+from stream import iter_analysis, page_count, read_page
+from templates import TemplateStore
+from worker import AnalysisCancelled, AnalysisWorker
+
+POLL_INTERVAL_MS = 16 # Poll worker results at ~60 fps while an analysis is pending
+OVERLAY_INTERVAL_MS = 500 # Refresh rate of the profiling overlay
+TEMPLATE_PLACEHOLDER = "Search templates..."
+TEMPLATE_SEARCH_DELAY_MS = 60 # Debounce for search-as-you-type in the template box
+TEMPLATE_RESULTS = 50 # Matches loaded into the template dropdown
+BUDGET_ELEMENTS_SHOWN = 4 # Largest elements listed next to the token count
+OVERLAY_STAGES = ("edit_to_display", "analysis", "scan", "highlight", "viewport", "listbox", "tooltip", "template_search", "budget") # Shown in order when recorded
+
+# --- Tooltip Class (Unchanged) ---
+class ToolTip:
+    """
+    Create a tooltip for a given widget.
+    """
+    def __init__(self, widget, text='widget info'):
+        self.widget = widget
+        self.text = text
+        self.tooltip_window = None
+        self._id = None # To store after() id
+        self._scheduled = False # Flag to check if already scheduled
+        widget.bind("<Enter>", self.schedule_tooltip)
+        widget.bind("<Leave>", self.leave)
+        widget.bind("<ButtonPress>", self.leave) # Hide on click too
+
+    def schedule_tooltip(self, event=None):
+        # Schedule tooltip appearance after a short delay (e.g., 500ms)
+        if not self._scheduled:
+             self._scheduled = True
+             self._id = self.widget.after(500, self.enter)
+
+    def enter(self, event=None):
+        self._scheduled = False # Reset scheduled flag
+        # If the cursor is still over the widget
+        if self.widget.winfo_containing(self.widget.winfo_pointerx(), self.widget.winfo_pointery()) == self.widget:
+            x, y, _, _ = self.widget.bbox("insert") # Get position relative to widget
+            # Adjust position if bbox is not available (e.g., for listbox items)
+            if x is None or y is None:
+                 x = event.x if event else 0
+                 y = event.y if event else 0
+
+            x += self.widget.winfo_rootx() + 20 # Offset from cursor
+            y += self.widget.winfo_rooty() + 20
+
+            # Creates a toplevel window
+            self.tooltip_window = Toplevel(self.widget)
+            self.tooltip_window.wm_overrideredirect(True) # No window decorations
+            self.tooltip_window.wm_geometry(f"+{x}+{y}")
+
+            label = tk.Label(self.tooltip_window, text=self.text, justify='left',
+                             background='#FFFFE0', relief='solid', borderwidth=1, # Light yellow background
+                             wraplength=350, # Wrap text if too long
+                             font=("Arial", 9, "normal"))
+            label.pack(ipadx=2, ipady=2)
+
+    def leave(self, event=None):
+        # Cancel scheduled tooltip if leaving before it appears
+        if self._id:
+             self.widget.after_cancel(self._id)
+             self._id = None
+             self._scheduled = False
+        # Destroy existing tooltip window
+        if self.tooltip_window:
+            self.tooltip_window.destroy()
+        self.tooltip_window = None
+
+# --- Large File Window ---
+
+class LargeFileWindow:
+    """Streams the analysis of a file too big for the input area and previews it page by page."""
+
+    def __init__(self, app, path):
+        self.app = app
+        self.path = path
+        self.page = 0
+        self.pages = page_count(path)
+        self.results = queue.Queue() # StreamSummary objects from the scanning thread
+        self._closed = False
+
+        self.window = Toplevel(app.root)
+        self.window.title(f"Large File: {os.path.basename(path)}")
+        self.window.geometry("800x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.summary_label = tk.Label(self.window, text="Analysing...", justify=tk.LEFT, anchor=tk.W, font=("Arial", 10))
+        self.summary_label.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        # Suggestions for this file; the main window's list belongs to the input prompt
+        self.suggestions_list = Listbox(self.window, height=5, font=("Arial", 9), relief=tk.FLAT, borderwidth=0)
+        self.suggestions_list.pack(fill=tk.X, padx=10, pady=(0, 5))
+        self.suggestions_list.bind("<Double-Button-1>", self.show_suggestion_detail)
+        self.suggestions_data = {}
+
+        self.preview = scrolledtext.ScrolledText(self.window, wrap=tk.WORD, state=tk.DISABLED, font=("Arial", 10))
+        self.preview.pack(fill=tk.BOTH, expand=True, padx=10)
+        for element, config in PROMPT_ELEMENTS.items():
+            self.preview.tag_configure(element, background=config["color"], font=("Arial", 10, "bold"))
+        self.highlighter = Highlighter(self.preview, PROMPT_ELEMENTS, line_local=app.analyzer.matcher.line_local)
+
+        nav_frame = tk.Frame(self.window)
+        nav_frame.pack(pady=5)
+        tk.Button(nav_frame, text="< Prev", command=lambda: self.show_page(self.page - 1)).pack(side=tk.LEFT)
+        self.page_label = tk.Label(nav_frame, width=20)
+        self.page_label.pack(side=tk.LEFT, padx=10)
+        tk.Button(nav_frame, text="Next >", command=lambda: self.show_page(self.page + 1)).pack(side=tk.LEFT)
+
+        self.show_page(0)
+        threading.Thread(target=self._scan, name="file-scan", daemon=True).start()
+        self.window.after(POLL_INTERVAL_MS, self.poll_results)
+
+    def _checkpoint(self):
+        if self._closed:
+            raise AnalysisCancelled()
+
+    def _scan(self):
+        try:
+            for summary in iter_analysis(self.path, self.app.analyzer, checkpoint=self._checkpoint):
+                self.results.put(summary)
+        except AnalysisCancelled:
+            pass
+        except (OSError, ValueError) as e:
+            self.results.put(e)
+
+    def show_page(self, page):
+        """Shows one page of the file, highlighted on its own."""
+        if not 0 <= page < self.pages:
+            return
+        self.page = page
+        text = read_page(self.path, page)
+        self.preview.config(state=tk.NORMAL)
+        self.highlighter.show(text, self.app.analyzer.matcher.scan(text))
+        self.preview.config(state=tk.DISABLED)
+        self.preview.yview_moveto(0)
+        self.page_label.config(text=f"Page {page + 1} of {self.pages}")
+
+    def poll_results(self):
+        """Shows the newest streamed summary and its suggestions."""
+        if self._closed:
+            return
+        latest = None
+        while True:
+            try:
+                latest = self.results.get_nowait()
+            except queue.Empty:
+                break
+        if isinstance(latest, Exception):
+            self.summary_label.config(text=f"Could not read file: {latest}")
+            return
+        if latest is not None:
+            counts = ", ".join(f"{element}: {count}" for element, count in latest.counts.items()) or "no elements"
+            details = ", ".join(f"{key}: {value}" for key, value in latest.analysis_details.items())
+            progress = "done" if latest.done else f"{latest.scanned / max(1, latest.size):.0%} scanned"
+            self.summary_label.config(text=f"{latest.size:,} bytes ({progress})\nElements: {counts}\nDetails: {details}")
+            self.update_suggestions(latest.suggestions)
+            if latest.done:
+                return
+        self.window.after(POLL_INTERVAL_MS * 6, self.poll_results)
+
+    def update_suggestions(self, suggestions):
+        """Populates this window's suggestions list from (suggestion_text, detail_text) pairs."""
+        self.suggestions_list.delete(0, END)
+        self.suggestions_data = {}
+        for suggestion_text, detail in suggestions:
+            self.suggestions_list.insert(END, suggestion_text)
+            self.suggestions_data[suggestion_text] = detail
+
+    def show_suggestion_detail(self, event):
+        """Shows the full text of a selected suggestion in a message box."""
+        selected_indices = self.suggestions_list.curselection()
+        if selected_indices:
+            suggestion_text = self.suggestions_list.get(selected_indices[0])
+            messagebox.showinfo("Suggestion Detail", self.suggestions_data.get(suggestion_text, "No details available."),
+                                parent=self.window)
+
+    def close(self):
+        self._closed = True # Stops the scanning thread at its next checkpoint
+        self.window.destroy()
+
+
+# --- Application Class ---
+
+class PromptBuilderApp:
+    def __init__(self, root, cache_mb=ANALYSIS_CACHE_MB, overlay=False):
+        self.root = root
+        self.root.title("Enhanced Prompt Builder & Analyzer (v3)")
+        self.root.geometry("1000x800") # Increased size further
+
+        self._analysis_job = None # To store the 'after' job ID for debouncing analysis
+        self.analyzer = PromptAnalyzer() # Tk-free analysis engine
+        self.analysis_cache = AnalysisCache(max_bytes=cache_mb * 1024 * 1024) # Results keyed by prompt hash
+        self.incremental = IncrementalAnalyzer(self.analyzer, cache=self.analysis_cache) # Rescans only edited lines
+        self.worker = AnalysisWorker(self.incremental) # Runs analysis off the Tk thread
+        self._generation = 0 # Bumped on every analysis request
+        self._shown_generation = 0 # Generation currently shown in the analysis pane
+        self._poll_job = None # 'after' job ID polling for worker results
+        self._submitted_at = {} # generation -> perf_counter() at submit, for edit-to-display latency
+
+        # --- Top Frame for Template Selection ---
+        top_frame = tk.Frame(root)
+        top_frame.pack(pady=(10, 5), padx=10, fill=tk.X)
+
+        tk.Label(top_frame, text="Load Template:", font=("Arial", 11)).pack(side=tk.LEFT, padx=(0, 5))
+
+        self.templates = TemplateStore() # On-disk template library, queried as you type
+        self._template_search_job = None
+        self.template_var = tk.StringVar()
+        self.template_combo = ttk.Combobox(top_frame, textvariable=self.template_var, width=40,
+                                           postcommand=self.search_templates)
+        self.template_combo.pack(side=tk.LEFT, padx=(0, 10))
+        self.template_var.set(TEMPLATE_PLACEHOLDER)
+        self.template_combo.bind("<<ComboboxSelected>>", self.load_template)
+        self.template_combo.bind("<KeyRelease>", self.schedule_template_search)
+        self.template_combo.bind("<Return>", self.load_best_template)
+        self.template_combo.bind("<FocusIn>", self.clear_template_placeholder)
+
+        # Tooltip for the Combobox
+        self.template_tooltip = ToolTip(self.template_combo, "")
+        # No need to bind <Enter> here, tooltip text updates when selection changes or on load_template
+
+        # --- Main Paned Window ---
+        paned_window = tk.PanedWindow(root, orient=tk.VERTICAL, sashrelief=tk.RAISED, sashwidth=5, background="#f0f0f0")
+        paned_window.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        # --- Input Area Frame ---
+        input_frame = tk.Frame(paned_window, bd=1, relief=tk.SUNKEN)
+        tk.Label(input_frame, text="Enter or Modify Prompt Here:", font=("Arial", 12, "bold")).pack(pady=(5,2), anchor=tk.W, padx=5)
+        self.input_text = scrolledtext.ScrolledText(input_frame, wrap=tk.WORD, height=15, width=100, font=("Arial", 10), undo=True, relief=tk.FLAT, borderwidth=0)
+        self.input_text.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
+        self.input_text.bind("<KeyRelease>", self.schedule_analysis) # Schedule analysis on key release
+        paned_window.add(input_frame, minsize=100) # Add minimum size
+
+        # --- Analysis and Suggestions Frame (Horizontal Paned Window) ---
+        analysis_suggestions_pane = tk.PanedWindow(paned_window, orient=tk.HORIZONTAL, sashrelief=tk.RAISED, sashwidth=5, background="#f0f0f0")
+
+        # --- Analysis Area Frame ---
+        analysis_frame = tk.Frame(analysis_suggestions_pane, bd=1, relief=tk.SUNKEN)
+        tk.Label(analysis_frame, text="Analysis (Highlighted):", font=("Arial", 12, "bold")).pack(pady=(5,2), anchor=tk.W, padx=5)
+        self.token_label = tk.Label(analysis_frame, text="", font=("Arial", 9), anchor=tk.W, justify=tk.LEFT)
+        self.token_label.pack(anchor=tk.W, padx=5)
+        self.analysis_text = scrolledtext.ScrolledText(analysis_frame, wrap=tk.WORD, height=15, width=60, state=tk.DISABLED, font=("Arial", 10), relief=tk.FLAT, borderwidth=0)
+        self.analysis_text.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
+        # Configure tags for highlighting
+        for element, config in PROMPT_ELEMENTS.items():
+            self.analysis_text.tag_configure(element, background=config["color"], font=("Arial", 10, "bold"))
+        self.highlighter = Highlighter(self.analysis_text, PROMPT_ELEMENTS, line_local=self.analyzer.matcher.line_local)
+        self._viewport_job = None # 'after_idle' job tagging newly visible lines of huge prompts
+        self.analysis_text.configure(yscrollcommand=self.on_analysis_scroll)
+        analysis_suggestions_pane.add(analysis_frame, minsize=200)
+
+        # --- Suggestions Area Frame ---
+        suggestions_frame = tk.Frame(analysis_suggestions_pane, bd=1, relief=tk.SUNKEN)
+        tk.Label(suggestions_frame, text="Suggestions & Techniques:", font=("Arial", 12, "bold")).pack(pady=(5,2), anchor=tk.W, padx=5)
+        self.suggestions_list = Listbox(suggestions_frame, height=15, width=50, font=("Arial", 9), relief=tk.FLAT, borderwidth=0)
+        self.suggestions_list.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
+        self.suggestions_list.bind("<Motion>", self.update_suggestion_tooltip)
+        self.suggestions_list.bind("<Double-Button-1>", self.show_suggestion_detail)
+        self.suggestion_tooltip = ToolTip(self.suggestions_list, "")
+        analysis_suggestions_pane.add(suggestions_frame, minsize=200)
+
+        paned_window.add(analysis_suggestions_pane, minsize=150)
+
+
+        # --- Bottom Frame for Copy Button ---
+        bottom_frame = tk.Frame(root)
+        bottom_frame.pack(pady=(5, 10))
+        self.copy_button = tk.Button(bottom_frame, text="Copy Input Prompt", command=self.copy_to_clipboard, font=("Arial", 10))
+        self.copy_button.pack(side=tk.LEFT, padx=5)
+        self.open_file_button = tk.Button(bottom_frame, text="Analyze Large File...", command=self.open_large_file, font=("Arial", 10))
+        self.open_file_button.pack(side=tk.LEFT, padx=5)
+
+        # --- Optional Profiling Overlay (status bar with p50/p95 per stage) ---
+        self.overlay_label = None
+        if overlay:
+            self.overlay_label = tk.Label(root, anchor=tk.W, font=("Courier", 9), bg="#e8e8e8", relief=tk.SUNKEN)
+            self.overlay_label.pack(side=tk.BOTTOM, fill=tk.X)
+            self.update_overlay()
+
+        # Initial analysis
+        self.analyze_prompt() # Perform initial analysis
+
+    def schedule_analysis(self, event=None):
+        """Schedules the analysis to run after a short delay to avoid running on every keystroke."""
+        # Cancel the previous job, if any
+        if self._analysis_job:
+            self.root.after_cancel(self._analysis_job)
+
+        # Schedule the new job
+        self._analysis_job = self.root.after(350, self.analyze_prompt) # Delay in milliseconds
+
+    def clear_template_placeholder(self, event=None):
+        if self.template_var.get() == TEMPLATE_PLACEHOLDER:
+            self.template_var.set("")
+
+    def schedule_template_search(self, event=None):
+        """Refreshes the dropdown matches shortly after the user stops typing."""
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        if self._template_search_job:
+            self.root.after_cancel(self._template_search_job)
+        self._template_search_job = self.root.after(TEMPLATE_SEARCH_DELAY_MS, self.search_templates)
+
+    def search_templates(self):
+        """Loads the best TEMPLATE_RESULTS matches for the typed text into the dropdown."""
+        self._template_search_job = None
+        query = self.template_var.get()
+        if query == TEMPLATE_PLACEHOLDER:
+            query = ""
+        with stage("template_search"):
+            self.template_combo["values"] = [name for name, _ in self.templates.search(query, limit=TEMPLATE_RESULTS)]
+
+    def load_best_template(self, event=None):
+        """Enter loads the typed template, or the best match for the typed text."""
+        if self.templates.get(self.template_var.get()) is None:
+            matches = self.templates.search(self.template_var.get(), limit=1)
+            if not matches:
+                return
+            self.template_var.set(matches[0][0])
+        self.load_template()
+
+    def update_combobox_tooltip(self):
+        """Update tooltip text for the combobox based on selection."""
+        data = self.templates.get(self.template_var.get())
+        if data is not None:
+            # Include technique name in Use Case description
+            tooltip_text = f"Technique: {data['name']}\n\n{data['description']}\n\nUse Case ({data['name']}): {data['use_case']}"
+            self.template_tooltip.text = tooltip_text
+        else:
+            self.template_tooltip.text = "Type to search the template library, then pick a match or press Enter."
+
+    def load_template(self, event=None):
+        """Loads the selected template into the input text area."""
+        data = self.templates.get(self.template_var.get())
+        if data is not None:
+            template_text = data["template"]
+            if self.input_text.get("1.0", tk.END).strip():
+                 if not messagebox.askyesno("Confirm Load", "Loading a template will replace the current text in the input area. Continue?"):
+                     self.template_var.set(TEMPLATE_PLACEHOLDER)
+                     self.update_combobox_tooltip() # Update tooltip after reset
+                     return
+
+            self.input_text.delete("1.0", tk.END)
+            self.input_text.insert("1.0", template_text)
+            self.update_combobox_tooltip() # Update tooltip after load
+            self.analyze_prompt() # Re-analyze after loading
+
+    def analyze_prompt(self):
+        """Sends the input text to the background worker for analysis."""
+        prompt = self.input_text.get("1.0", tk.END).strip()
+        self._generation += 1 # Edit generation; older results are discarded
+        if PROFILER.enabled:
+            self._submitted_at = {self._generation: time.perf_counter()} # Superseded edits never display
+        self.worker.submit(self._generation, prompt)
+        if self._poll_job is None:
+            self._poll_job = self.root.after(POLL_INTERVAL_MS, self.poll_analysis_results)
+
+    def poll_analysis_results(self):
+        """Drains finished analyses from the worker and shows the newest one."""
+        self._poll_job = None
+        latest = None
+        while True:
+            try:
+                generation, result = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation: # Stale results are dropped
+                latest = result
+        if isinstance(latest, Exception):
+            self.update_suggestions([("[!] Analysis failed", f"The prompt could not be analysed:\n\n{latest}")])
+            self._shown_generation = self._generation
+        elif latest is not None:
+            self.show_analysis(latest)
+            self._shown_generation = self._generation
+            submitted = self._submitted_at.pop(self._generation, None)
+            if submitted is not None:
+                PROFILER.record("edit_to_display", time.perf_counter() - submitted)
+        if self._shown_generation != self._generation:
+            self._poll_job = self.root.after(POLL_INTERVAL_MS, self.poll_analysis_results)
+
+    def show_analysis(self, result):
+        """Highlights elements and updates suggestions from an analysis result."""
+        self.analysis_text.config(state=tk.NORMAL)
+        # --- Highlighting (only changed text and tag ranges are touched) ---
+        with stage("highlight"):
+            self.highlighter.show(result.prompt, result.store, result.line_index)
+        self.analysis_text.config(state=tk.DISABLED)
+
+        self.update_token_label(result)
+
+        # Update suggestions based on analysis details
+        with stage("listbox"):
+            self.update_suggestions(result.suggestions)
+
+    def update_token_label(self, result):
+        """Shows the estimated token count and the largest elements' share of it."""
+        tokens = result.analysis_details.get("tokens", 0)
+        text = f"~{tokens:,} tokens"
+        budget = getattr(result, "budget", None)
+        if budget:
+            largest = sorted(budget["by_element"].items(), key=lambda item: -item[1])[:BUDGET_ELEMENTS_SHOWN]
+            text += " (" + ", ".join(f"{element} {count:,}" for element, count in largest) + ")"
+            if budget["variable"]:
+                text += f"; cacheable prefix ~{budget['prefix']:,}"
+        self.token_label.config(text=text)
+
+    def on_analysis_scroll(self, first, last):
+        """Keeps the scrollbar in sync and, in lazy mode, tags lines scrolled into view."""
+        self.analysis_text.vbar.set(first, last)
+        if self.highlighter.lazy and self._viewport_job is None:
+            self._viewport_job = self.root.after_idle(self.refresh_viewport)
+
+    def refresh_viewport(self):
+        self._viewport_job = None
+        with stage("viewport"):
+            self.highlighter.refresh_viewport()
+
+    def update_suggestions(self, suggestions):
+        """Populates the suggestions list from (suggestion_text, detail_text) pairs."""
+        self.suggestions_list.delete(0, END)
+        suggestions_data = {} # Store text -> full data mapping for tooltips
+        for suggestion_text, detail in suggestions:
+            self.suggestions_list.insert(END, suggestion_text)
+            suggestions_data[suggestion_text] = detail
+
+        # Store the data mapping for tooltips
+        self.suggestions_data = suggestions_data
+
+    def update_suggestion_tooltip(self, event):
+        """Update tooltip for the suggestion list based on the item under cursor."""
+        with stage("tooltip"):
+            self._update_suggestion_tooltip(event)
+
+    def _update_suggestion_tooltip(self, event):
+        try:
+            # Get index of item under cursor
+            index = self.suggestions_list.index(f"@{event.x},{event.y}")
+            suggestion_text = self.suggestions_list.get(index)
+            # Retrieve full text from stored data
+            full_text = self.suggestions_data.get(suggestion_text, "No details available.")
+            # Update the tooltip text and schedule it
+            self.suggestion_tooltip.text = full_text
+            self.suggestion_tooltip.schedule_tooltip(event) # Use schedule method from Tooltip class
+        except tk.TclError:
+             # Error occurs if cursor is not over an item, hide tooltip
+             self.suggestion_tooltip.leave()
+
+    def update_overlay(self):
+        """Refreshes the profiling status bar with p50/p95 latencies per stage."""
+        recorded = set(PROFILER.stage_names())
+        parts = []
+        for name in OVERLAY_STAGES:
+            if name in recorded:
+                p50, p95 = PROFILER.percentiles(name)
+                parts.append(f"{name} {p50:.1f}/{p95:.1f}")
+        parts.append(f"cache hits {self.analysis_cache.stats()['hit_rate']:.0%}")
+        self.overlay_label.config(text="p50/p95 ms  " + "  |  ".join(parts))
+        self.root.after(OVERLAY_INTERVAL_MS, self.update_overlay)
+
+    def show_suggestion_detail(self, event):
+        """Shows the full text of a selected suggestion in a message box."""
+        try:
+            selected_indices = self.suggestions_list.curselection()
+            if not selected_indices: return
+            selected_index = selected_indices[0]
+            suggestion_text = self.suggestions_list.get(selected_index)
+            full_text = self.suggestions_data.get(suggestion_text, "No details available.")
+            messagebox.showinfo("Suggestion Detail", full_text)
+        except IndexError:
+            pass
+
+    def open_large_file(self):
+        """Analyses a file in the background without loading it into the input area."""
+        path = filedialog.askopenfilename(title="Analyze Large File",
+                                          filetypes=[("Text files", "*.txt *.md *.prompt"), ("All files", "*")])
+        if path:
+            LargeFileWindow(self, path)
+
+    def copy_to_clipboard(self):
+        """Copies the content of the INPUT text area to the clipboard."""
+        prompt_to_copy = self.input_text.get("1.0", tk.END).strip()
+        if prompt_to_copy:
+            try:
+                import pyperclip # Loaded on first copy; requires installation: pip install pyperclip
+                pyperclip.copy(prompt_to_copy)
+                messagebox.showinfo("Copied!", "Input prompt copied to clipboard.")
+            except Exception as e:
+                # Handle specific pyperclip errors if possible
+                if "clipboard" in str(e).lower():
+                     messagebox.showerror("Clipboard Error", f"Could not access the system clipboard.\nEnsure clipboard utilities are available (e.g., xclip/xsel on Linux).\n\nError: {e}")
+                else:
+                     messagebox.showerror("Clipboard Error", f"Could not copy to clipboard:\n{e}\n\nMake sure 'pyperclip' is installed (`pip install pyperclip`).")
+        else:
+            messagebox.showwarning("Empty Prompt", "Nothing to copy from the input area.")
+
+
+# --- Main Execution ---
+def run_gui(cache_mb=ANALYSIS_CACHE_MB, overlay=False, probe=False):
+    """Opens the main window; with probe, closes it again as soon as it is first drawn."""
+    main_window = tk.Tk()
+    # Basic theming attempt (may vary by OS)
+    style = ttk.Style()
+    try:
+        # Use a theme that generally looks better if available
+        available_themes = style.theme_names()
+        if 'clam' in available_themes:
+            style.theme_use('clam')
+        elif 'alt' in available_themes:
+            style.theme_use('alt')
+        # Configure Combobox style if needed
+        # style.configure('TCombobox', ...)
+    except tk.TclError:
+        print("ttk themes not available or failed to apply.")
+
+    main_window.configure(bg="#f0f0f0") # Set a light grey background
+
+    app = PromptBuilderApp(main_window, cache_mb=cache_mb, overlay=overlay)
+    if probe: # Cold-start measurement: quit once the first frame has been drawn
+        def close(event):
+            main_window.unbind("<Map>") # Children fire <Map> through the toplevel's bindings too
+            main_window.after_idle(main_window.destroy)
+        main_window.bind("<Map>", close)
+    main_window.mainloop()
+
@@ -0,0 +1,182 @@
+"""Batched highlighting for a Tk Text widget.
+
+Character offsets are converted to ``line.col`` indices through a precomputed
+line-start table, so Tk never has to walk the text to resolve ``1.0+Nc``.
+Ranges are applied with one multi-range ``tag add``/``tag remove`` call per
+tag, and on re-analysis only the ranges that actually changed are touched.
+
+Texts of LAZY_THRESHOLD characters or more are tagged lazily: only spans
+starting in the visible lines plus a margin are tagged, and
+``refresh_viewport`` (hooked to the widget's ``yscrollcommand``) tags more as
+the view scrolls. Spans are read from the analysis' SpanStore by offset range.
+This module does not import tkinter; it only talks to the widget it is given.
+"""
+from bisect import bisect_right
+from itertools import accumulate
+
+from incremental import edit_bounds
+from spans import SpanStore
+
+_BATCH = 4096 # Ranges per Tcl call, to keep argument lists bounded
+LAZY_THRESHOLD = 1_000_000 # Characters; longer texts are only tagged around the viewport
+VIEWPORT_MARGIN = 200 # Lines tagged above and below the visible ones in lazy mode
+
+
+class LineIndex:
+    """Maps character offsets in a text to Tk ``line.col`` indices."""
+
+    def __init__(self, text):
+        self.starts = list(accumulate((len(line) + 1 for line in text.split("\n")), initial=0))
+
+    def index(self, offset):
+        line = bisect_right(self.starts, offset) - 1
+        return f"{line + 1}.{offset - self.starts[line]}"
+
+
+class Highlighter:
+    """Keeps a read-only Text widget in sync with a text and its element spans."""
+
+    def __init__(self, widget, tags, line_local=True, lazy_threshold=LAZY_THRESHOLD, margin=VIEWPORT_MARGIN):
+        self.widget = widget
+        self.tags = list(tags) # Tag names, one per element
+        self.line_local = line_local # Spans never cross a line break, so diffs stay local
+        self.lazy_threshold = lazy_threshold # None disables lazy mode
+        self.margin = margin
+        self.text = ""
+        self.store = SpanStore(())
+        self.line_index = LineIndex("")
+        self.lazy = False
+        self.applied = {} # Lazy mode only: tag -> set of spans currently tagged in the widget
+        self.window = (0, 0) # Lazy mode only: offsets whose spans are tagged
+
+    def show(self, text, store, line_index=None):
+        """Shows text with the tag spans in store (a SpanStore), editing only what changed.
+
+        Returns the number of tag ranges added plus removed.
+        """
+        bounds = edit_bounds(self.text, text)
+        if bounds is None and store is self.store:
+            return 0
+        start, old_end, new_end = bounds or (0, 0, 0)
+        line_index = line_index or LineIndex(text)
+        old_index = self.line_index
+
+        if bounds is not None:
+            # Minimal text edit: Tk shifts the tags on untouched text for us
+            self.widget.delete(old_index.index(start), old_index.index(old_end))
+            self.widget.insert(old_index.index(start), text[start:new_end], ())
+
+        lazy = self.lazy_threshold is not None and len(text) >= self.lazy_threshold
+        if lazy or self.lazy:
+            return self._show_lazy(text, store, line_index, start, old_end, new_end, lazy)
+
+        # Lines whose spans may differ; everything if spans can cross lines
+        if self.line_local and bounds is not None:
+            region_start = text.rfind("\n", 0, start) + 1
+            region_end = text.find("\n", new_end)
+            region_end = len(text) if region_end == -1 else region_end
+        else:
+            region_start, region_end = 0, len(text)
+        delta = new_end - old_end
+        old_region_end = region_end - delta
+
+        changed = 0
+        old_region = self.store.group(self.tags, region_start, old_region_end)
+        new_region = store.group(self.tags, region_start, region_end)
+        for tag in self.tags:
+            kept, remove = set(), []
+            for s, e in old_region.get(tag, ()):
+                if e <= start:
+                    kept.add((s, e))
+                elif s >= old_end:
+                    kept.add((s + delta, e + delta))
+                else: # Damaged by the text edit; clear what is left of it
+                    remove.append((min(s, start), max(e + delta, new_end)))
+            wanted = set(new_region.get(tag, ()))
+            remove.extend(kept - wanted)
+            add = wanted - kept
+            self._apply("remove", tag, sorted(remove), line_index)
+            self._apply("add", tag, sorted(add), line_index)
+            changed += len(remove) + len(add)
+
+        self.text, self.store, self.line_index = text, store, line_index
+        return changed
+
+    def _show_lazy(self, text, store, line_index, start, old_end, new_end, lazy):
+        """show() for texts entering, in or leaving lazy mode."""
+        changed = 0
+        if not self.lazy or not lazy:
+            # Switching modes: start from an untagged widget
+            for tag in self.tags:
+                self.widget.tk.call(self.widget._w, "tag", "remove", tag, "1.0", "end")
+            self.applied = {tag: set() for tag in self.tags}
+        else:
+            # Follow the text edit the way Tk moved the tags
+            delta = new_end - old_end
+            for tag in self.tags:
+                shifted, damaged = set(), []
+                for s, e in self.applied[tag]:
+                    if e <= start:
+                        shifted.add((s, e))
+                    elif s >= old_end:
+                        shifted.add((s + delta, e + delta))
+                    else:
+                        damaged.append((min(s, start), max(e + delta, new_end)))
+                self._apply("remove", tag, sorted(damaged), line_index)
+                self.applied[tag] = shifted
+                changed += len(damaged)
+
+        self.text, self.store, self.line_index = text, store, line_index
+        self.lazy = lazy
+        if not lazy:
+            grouped = store.group(self.tags)
+            for tag in self.tags:
+                ranges = grouped.get(tag, ())
+                self._apply("add", tag, ranges, line_index)
+                changed += len(ranges)
+            self.applied = {}
+            return changed
+        self.window = (0, 0)
+        return changed + self.refresh_viewport()
+
+    def visible_window(self):
+        """Offsets [start, end) of the visible lines plus the margin, snapped to lines."""
+        first = int(self.widget.index("@0,0").split(".")[0])
+        last = int(self.widget.index(f"@0,{self.widget.winfo_height()}").split(".")[0])
+        starts = self.line_index.starts
+        window_start = starts[max(0, first - 1 - self.margin)]
+        window_end = starts[min(len(starts) - 1, last + self.margin)]
+        return window_start, min(window_end, len(self.text))
+
+    def refresh_viewport(self):
+        """Lazy mode: tags spans near the visible lines and untags those scrolled away.
+
+        Returns the number of tag ranges added plus removed (0 outside lazy mode).
+        """
+        if not self.lazy:
+            return 0
+        window = self.visible_window()
+        if window == self.window:
+            return 0
+        window_start, window_end = window
+        changed = 0
+        visible = self.store.group(self.tags, window_start, window_end)
+        for tag in self.tags:
+            wanted = set(visible.get(tag, ()))
+            applied = self.applied[tag]
+            remove, add = applied - wanted, wanted - applied
+            self._apply("remove", tag, sorted(remove), self.line_index)
+            self._apply("add", tag, sorted(add), self.line_index)
+            self.applied[tag] = wanted
+            changed += len(remove) + len(add)
+        self.window = window
+        return changed
+
+    def _apply(self, action, tag, ranges, line_index):
+        index = line_index.index
+        for i in range(0, len(ranges), _BATCH):
+            indices = []
+            for s, e in ranges[i:i + _BATCH]:
+                indices.append(index(s))
+                indices.append(index(e))
+            self.widget.tk.call(self.widget._w, "tag", action, tag, *indices)
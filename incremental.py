@@ -0,0 +1,169 @@
+"""Incremental re-analysis: rescan only the lines touched by an edit.
+
+The previous prompt's matches are kept in a SpanStore. On each update the
+edited range is found by comparing the old and new text, widened by an overlap
+window and snapped to whole lines, and only that range is rescanned. Matches
+before it are kept, matches after it are shifted, and the counts behind
+``analysis_details`` are adjusted by the difference. The token count is kept
+the same way (see tokens.IncrementalTokenCounter).
+"""
+from analyzer import AnalysisResult, PromptAnalyzer
+from cache import CachedAnalysis, prompt_key
+from profiling import stage
+from tokens import IncrementalTokenCounter
+
+_BLOCK = 4096 # Chunk size for locating the first/last differing character
+
+
+def _common_prefix(old, new):
+    limit = min(len(old), len(new))
+    n = 0
+    while n + _BLOCK <= limit and old[n:n + _BLOCK] == new[n:n + _BLOCK]:
+        n += _BLOCK
+    while n < limit and old[n] == new[n]:
+        n += 1
+    return n
+
+
+def _common_suffix(old, new, prefix):
+    """Length of the common suffix, never overlapping the common prefix."""
+    limit = min(len(old), len(new)) - prefix
+    old_len, new_len = len(old), len(new)
+    n = 0
+    while n + _BLOCK <= limit and old[old_len - n - _BLOCK:old_len - n] == new[new_len - n - _BLOCK:new_len - n]:
+        n += _BLOCK
+    while n < limit and old[old_len - n - 1] == new[new_len - n - 1]:
+        n += 1
+    return n
+
+
+def edit_bounds(old, new):
+    """Returns the exact (start, old_end, new_end) of the edit, or None if equal.
+
+    old[start:old_end] was replaced by new[start:new_end].
+    """
+    if old == new:
+        return None
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, prefix)
+    return prefix, len(old) - suffix, len(new) - suffix
+
+
+def changed_region(old, new, overlap=64):
+    """Returns (start, old_end, new_end) line-aligned bounds of the edit, or None.
+
+    Like edit_bounds, but widened by overlap characters on each side and
+    snapped so both ranges begin at a line start and end at a line break (or
+    the end of the text).
+    """
+    bounds = edit_bounds(old, new)
+    if bounds is None:
+        return None
+    prefix, _, changed_end = bounds
+    start = new.rfind("\n", 0, max(0, prefix - overlap)) + 1
+    new_end = new.find("\n", min(len(new), changed_end + overlap))
+    if new_end == -1:
+        new_end = len(new)
+    return start, new_end - (len(new) - len(old)), new_end
+
+
+class IncrementalResult(AnalysisResult):
+    """Analysis result plus the region that changed since the previous update."""
+
+    def __init__(self, prompt, elements, store, found_elements, analysis_details, suggestions, region, region_spans, full, cached=False):
+        super().__init__(prompt, store, found_elements, analysis_details, suggestions, elements)
+        self.region = region # (start, old_end, new_end), or None if nothing changed
+        self.region_spans = region_spans # (element, start, end) spans inside the new region
+        self.full = full # True if the whole prompt was rescanned
+        self.cached = cached # True if served from the analysis cache without scanning
+
+
+class IncrementalAnalyzer:
+    """Stateful analyzer that rescans only the edited lines of a prompt."""
+
+    def __init__(self, analyzer=None, overlap=64, cache=None):
+        self.analyzer = analyzer or PromptAnalyzer()
+        self.overlap = overlap # Extra characters rescanned on each side of an edit
+        self.cache = cache # Optional AnalysisCache; must not be shared with other element tables
+        self.token_counter = IncrementalTokenCounter(self.analyzer.tokens)
+        self.reset()
+
+    def reset(self):
+        """Forgets the previous prompt; the next update rescans everything."""
+        self.prompt = None
+        self.store = None
+        self.word_count = 0
+        self.token_counter.reset()
+
+    def update(self, prompt, checkpoint=None):
+        """Analyses prompt, reusing the matches of the previous update where possible.
+
+        checkpoint is passed to the matcher; if it raises, the analyzer's state is
+        left as it was after the previous completed update.
+        """
+        key = None
+        if self.cache is not None and prompt != self.prompt:
+            with stage("cache_lookup"):
+                key = prompt_key(prompt)
+                entry = self.cache.get(key)
+            if entry is not None:
+                return self._restore(prompt, entry)
+
+        matcher = self.analyzer.matcher
+        region = None
+        full = self.prompt is None or not matcher.line_local
+        if not full:
+            with stage("diff"):
+                region = changed_region(self.prompt, prompt, self.overlap)
+
+        if full:
+            with stage("scan"):
+                self.store = matcher.scan(prompt, checkpoint=checkpoint)
+            self.word_count = len(prompt.split())
+            region = (0, len(self.prompt or ""), len(prompt))
+            region_spans = list(self.store.iter_spans(self.analyzer.elements))
+        elif region is None:
+            region_spans = []
+        else:
+            region_spans = self._rescan(prompt, *region, checkpoint=checkpoint)
+
+        with stage("tokens"):
+            counter = self.token_counter
+            if full or counter.text is not self.prompt: # After a cache hit the counter was left behind
+                counter.reset()
+                tokens = counter.update(prompt, (0, 0, len(prompt)))
+            elif region is None:
+                tokens = counter.total
+            else:
+                tokens = counter.update(prompt, region)
+        self.prompt = prompt
+        counts = self.store.counts()
+        with stage("summarize"):
+            found_elements, analysis_details = self.analyzer.summarize(self.word_count, counts, self.store,
+                                                                       tokens=tokens)
+        with stage("suggest"):
+            suggestions = self.analyzer.suggest(prompt, found_elements, analysis_details, counts)
+        result = IncrementalResult(prompt, self.analyzer.elements, self.store, found_elements,
+                                   analysis_details, suggestions, region, region_spans, full)
+        if key is not None:
+            self.cache.put(key, CachedAnalysis(self.store, found_elements, analysis_details,
+                                               suggestions, self.word_count))
+        return result
+
+    def _restore(self, prompt, entry):
+        """Adopts a cached analysis as the current state without scanning."""
+        old_length = len(self.prompt or "")
+        self.prompt = prompt
+        self.store = entry.store
+        self.word_count = entry.word_count
+        region_spans = list(self.store.iter_spans(self.analyzer.elements))
+        return IncrementalResult(prompt, self.analyzer.elements, self.store, set(entry.found_elements),
+                                 dict(entry.analysis_details), list(entry.suggestions),
+                                 (0, old_length, len(prompt)), region_spans, False, cached=True)
+
+    def _rescan(self, prompt, start, old_end, new_end, checkpoint=None):
+        with stage("scan"):
+            fresh = self.analyzer.matcher.scan(prompt, start, new_end, checkpoint)
+        self.word_count += len(prompt[start:new_end].split()) - len(self.prompt[start:old_end].split())
+        self.store = self.store.splice(start, old_end, new_end - old_end, fresh)
+        return list(fresh.iter_spans(self.analyzer.elements))
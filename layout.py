@@ -0,0 +1,347 @@
+"""Prefix-cache layout analysis.
+
+LLM providers can reuse work for requests that share a byte-identical prompt
+prefix, so static instructions should come before anything that changes per
+request. This module splits a prompt into sections at blank lines, separator
+lines (``---``, ``###``) and lines that open with an element label (the same
+Instruction / Context / Input Data / Role / ... spans the analyzer finds).
+Fenced blocks stay whole. Each section is then classed as static or variable:
+
+* If the prompt has template slots (``[...]``, ``{{...}}``, ``{name}``,
+  ``<<...>>``), a section is variable from its first slot.
+* Otherwise a section opened by an Input Data or Context label is variable
+  after the label, except inside few-shot examples.
+
+The report gives the longest cacheable prefix as it stands, and a stable
+reordering (static sections first) that maximises it. shared_prefixes() looks
+across many prompts for common leading text worth standardising.
+"""
+import json
+import os
+import re
+import sys
+
+from analyzer import PromptAnalyzer
+from prompt_data import PROMPT_ELEMENTS
+
+LABEL_ELEMENTS = ("Instruction", "Context", "Input Data", "Role", "Output Format", "Example Marker")
+VARIABLE_LABELS = ("Input Data", "Context")
+LABEL_LEAD = " \t#*->" # Characters allowed before a label at the start of a line
+LABEL_RE = re.compile(r"(?m)^[ \t#*>-]*([A-Za-z][A-Za-z0-9 ()/_-]{0,40}?)[ \t]*:")
+EXTRA_LABEL_WORDS = {
+    "example": "Example Marker", "instruction": "Instruction", "instructions": "Instruction", "task": "Instruction",
+    "role": "Role", "persona": "Role", "output": "Output Format", "format": "Output Format",
+    "question": "Input Data", "query": "Input Data", "transcript": "Input Data", "passage": "Context",
+}
+FENCES = ("```", '"""')
+SEPARATORS = ("---", "###", "##")
+BACK_REFERENCE = re.compile(r"(?i)\b(above|previous|preceding|earlier|aforementioned)\b")
+MIN_SHARED_CHARS = 200 # Shorter common prefixes are not worth standardising
+MAX_SHARED_RESULTS = 20
+PREVIEW_CHARS = 120
+
+
+def _label_words(elements=PROMPT_ELEMENTS):
+    """Label word -> element: the "word:" forms of the element keywords, plus common headings."""
+    words = {}
+    for name, config in elements.items():
+        for word in re.findall(r"[a-z ]+(?=:)", config["keywords_regex"]):
+            words.setdefault(word.strip(), name)
+    words.update(EXTRA_LABEL_WORDS)
+    return words
+
+
+LABEL_WORDS = _label_words()
+
+
+class Section:
+    """One static or variable region of a prompt."""
+
+    __slots__ = ("start", "end", "kind", "reason", "variable_start", "label", "element")
+
+    def __init__(self, start, end, kind, reason, variable_start, label=None, element=None):
+        self.start = start
+        self.end = end
+        self.kind = kind # "static" or "variable"
+        self.reason = reason # Why it is variable (placeholder, Input Data, Context), else None
+        self.variable_start = variable_start # First variable offset (== end for static sections)
+        self.label = label # Label text on the section's first line, if any
+        self.element = element # Element the label belongs to, if known
+
+    def to_dict(self):
+        return {"start": self.start, "end": self.end, "kind": self.kind, "reason": self.reason,
+                "variable_start": self.variable_start, "label": self.label, "element": self.element}
+
+
+class LayoutReport:
+    """Static/variable sections of one prompt and the cacheable prefix before and after reordering."""
+
+    def __init__(self, prompt, sections):
+        self.prompt = prompt
+        self.sections = sections
+        first = next((section for section in sections if section.kind == "variable"), None)
+        self.prefix_chars = len(prompt) if first is None else first.variable_start
+        self.static_chars = sum(section.variable_start - section.start for section in sections)
+
+        static = [section for section in sections if section.kind == "static"]
+        variable = [section for section in sections if section.kind == "variable"]
+        self.reordered = static + variable
+        self.reorder_needed = self.reordered != sections
+        self.warnings = []
+        if self.reorder_needed:
+            moved = [section for section in static if first is not None and section.start > first.start]
+            for section in moved:
+                match = BACK_REFERENCE.search(prompt, section.start, section.end)
+                if match:
+                    self.warnings.append(f"Static text at {section.start} refers to '{match.group()}' content;"
+                                         " reword it when moving it ahead of the variable input")
+
+    def _section_text(self, section):
+        text = self.prompt[section.start:section.end]
+        if text.endswith("\n"):
+            return text
+        return text + ("\n\n" if "\n\n" in self.prompt else "\n") # The last section gains a break when moved
+
+    def reordered_prompt(self):
+        """The prompt with every static section moved ahead of the variable ones (original order kept)."""
+        return "".join(self._section_text(section) for section in self.reordered).rstrip()
+
+    def cacheable_prefix(self, reordered=True):
+        """Text that stays byte-identical across requests, after (or before) reordering."""
+        if not (reordered and self.reorder_needed):
+            return self.prompt[:self.prefix_chars]
+        parts = []
+        for section in self.reordered:
+            if section.kind == "variable":
+                parts.append(self.prompt[section.start:section.variable_start])
+                break
+            parts.append(self._section_text(section))
+        return "".join(parts)
+
+    def to_dict(self):
+        prefix = self.prompt[:self.prefix_chars]
+        reordered_prefix = self.cacheable_prefix()
+        report = {
+            "total_chars": len(self.prompt),
+            "static_chars": self.static_chars,
+            "prefix_chars": self.prefix_chars,
+            "prefix_bytes": len(prefix.encode("utf-8")),
+            "reordered_prefix_chars": len(reordered_prefix),
+            "reordered_prefix_bytes": len(reordered_prefix.encode("utf-8")),
+            "reorder_suggested": self.reorder_needed,
+            "sections": [section.to_dict() for section in self.sections],
+            "warnings": self.warnings,
+        }
+        if self.reorder_needed:
+            report["suggested_order"] = [self.sections.index(section) for section in self.reordered]
+            report["suggested_prompt"] = self.reordered_prompt()
+        return report
+
+
+def _label_element(label):
+    words = label.lower().split()
+    if words[0] == "example":
+        return "Example Marker"
+    return LABEL_WORDS.get(" ".join(words[-2:])) or LABEL_WORDS.get(words[-1])
+
+
+def _label_kind(element):
+    if element in VARIABLE_LABELS:
+        return "data"
+    return "example" if element == "Example Marker" else "other"
+
+
+def _labels(prompt, store):
+    """{line start: (label end, kind, label text, element)} for the labels that open lines.
+
+    A label is a short "Name:" at the start of a line, or an element marker
+    there (e.g. an Instruction verb); kind is "data", "example" or "other".
+    """
+    labels = {}
+    for match in LABEL_RE.finditer(prompt):
+        element = _label_element(match.group(1))
+        labels[match.start()] = (match.end(), _label_kind(element), match.group(1), element)
+    for start, end, name in store.iter_spans(LABEL_ELEMENTS):
+        line_start = prompt.rfind("\n", 0, start) + 1
+        if line_start in labels or prompt[line_start:start].strip(LABEL_LEAD):
+            continue # Already labelled, or a mid-line mention
+        labels[line_start] = (end, _label_kind(name), prompt[start:end], name)
+    return labels
+
+
+def _section_starts(prompt, labels):
+    """Offsets where a new section begins."""
+    starts = []
+    fence = None
+    open_section = False # A non-blank line has been seen since the last break
+    after_separator = False
+    pos = 0
+    for line in prompt.split("\n"):
+        line_start, pos = pos, pos + len(line) + 1
+        stripped = line.strip()
+        if fence:
+            if stripped.startswith(fence):
+                fence = None
+            continue
+        if not stripped:
+            open_section = False # Blank lines stay with the section before them
+            continue
+        fence = next((f for f in FENCES if stripped.startswith(f) and stripped.count(f) == 1), None)
+        if stripped in SEPARATORS:
+            starts.append(line_start) # A separator leads the section it introduces
+            open_section, after_separator = True, True
+            continue
+        if not open_section or (line_start in labels and not after_separator):
+            starts.append(line_start)
+        open_section, after_separator = True, False
+    if not starts:
+        return [0]
+    starts[0] = 0 # Leading blank lines belong to the first section
+    return starts
+
+
+def _after_blank_line(prompt, start):
+    """True if the line before the one starting at start is blank (or there is none)."""
+    if start < 2:
+        return True
+    previous = prompt.rfind("\n", 0, start - 1)
+    return not prompt[previous + 1:start - 1].strip()
+
+
+def analyze_layout(prompt, store=None, analyzer=None):
+    """Splits a prompt into static and variable sections; returns a LayoutReport.
+
+    store is the prompt's SpanStore from a previous analysis, if there is one.
+    """
+    if store is None:
+        store = (analyzer or PromptAnalyzer()).matcher.scan(prompt)
+    labels = _labels(prompt, store)
+    starts = _section_starts(prompt, labels)
+    slots = [(start, prompt[start]) for start, _, _ in store.iter_spans(("placeholder",))]
+
+    sections = []
+    slot = 0 # First slot not before the current section
+    in_example = False
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(prompt)
+        # The label is on the section's first line, possibly after a separator line
+        line_start = start
+        if prompt[start:end].split("\n", 1)[0].strip() in SEPARATORS:
+            line_start = prompt.find("\n", start) + 1 or end
+        label_end, label_kind, label, element = labels.get(line_start, (None, None, None, None))
+        if label_kind == "example":
+            in_example = True # Input labels inside a few-shot example are part of the static demo
+        elif line_start != start or _after_blank_line(prompt, start):
+            in_example = False
+
+        while slot < len(slots) and slots[slot][0] < start:
+            slot += 1
+        section_slots = []
+        for position, first in slots[slot:]:
+            if position >= end:
+                break
+            section_slots.append((position, first))
+        runtime = next((position for position, first in section_slots if first != "["), None)
+        bracket = next((position for position, first in section_slots if first == "["), None)
+
+        candidates = [] # (variable start, reason)
+        if runtime is not None: # {{name}}, {name} and <<name>> are filled per request
+            candidates.append((runtime, "placeholder"))
+        if not in_example:
+            if label_kind == "data":
+                content = label_end + len(prompt[label_end:end]) - len(prompt[label_end:end].lstrip())
+                candidates.append((content if bracket is None else bracket, label))
+            elif label_kind is None and bracket is not None:
+                # [...] under an Instruction/Role/... label is filled in once when writing the template
+                candidates.append((bracket, "placeholder"))
+        kind, reason, variable_start = "static", None, end
+        if candidates:
+            variable_start, reason = min(candidates)
+            kind = "variable"
+        if variable_start >= end:
+            kind, reason, variable_start = "static", None, end # Label with nothing after it
+        sections.append(Section(start, end, kind, reason, variable_start, label, element))
+    return LayoutReport(prompt, sections)
+
+
+def shared_prefixes(reports, min_files=2, min_chars=MIN_SHARED_CHARS, top=MAX_SHARED_RESULTS):
+    """Finds leading text shared by several prompts, line by line, after reordering.
+
+    reports: iterable of (path, LayoutReport). Lines are compared with trailing
+    whitespace removed, so prompts that differ only there are reported with
+    exact=False: they need standardising before a provider cache can share them.
+    Returns [{"files", "paths", "shared_chars", "exact", "already_shared", "savings_bytes", "preview"}],
+    best savings first.
+    """
+    root = {"children": {}}
+    reports = list(reports)
+    for path, report in reports:
+        node = root
+        for line in report.cacheable_prefix().splitlines(True): # Trie of prefix lines
+            key = line.rstrip()
+            child = node["children"].get(key)
+            if child is None:
+                child = node["children"][key] = {"children": {}, "paths": [], "raw": line, "exact": True}
+            elif child["raw"] != line:
+                child["exact"] = False
+            child["paths"].append(path)
+            node = child
+
+    current = {path: report.cacheable_prefix(reordered=False) for path, report in reports}
+    results = []
+    stack = [(root, "", True)]
+    while stack: # Iterative: prefixes can be thousands of lines deep
+        node, text, exact = stack.pop()
+        for child in node["children"].values():
+            paths = child["paths"]
+            if len(paths) < min_files:
+                continue
+            child_text, child_exact = text + child["raw"], exact and child["exact"]
+            # Report the deepest line shared by this exact set of files
+            if len(child_text) >= min_chars and all(len(grandchild["paths"]) < len(paths)
+                                                    for grandchild in child["children"].values()):
+                results.append({
+                    "files": len(paths),
+                    "paths": paths,
+                    "shared_chars": len(child_text),
+                    "exact": child_exact,
+                    "already_shared": all(current[path].startswith(child_text) for path in paths),
+                    "savings_bytes": len(child_text.encode("utf-8")) * (len(paths) - 1),
+                    "preview": child_text[:PREVIEW_CHARS],
+                })
+            stack.append((child, child_text, child_exact))
+    results.sort(key=lambda result: result["savings_bytes"], reverse=True)
+    return results[:top]
+
+
+def run_layout(path, out=None, analyzer=None, min_chars=MIN_SHARED_CHARS):
+    """Writes the layout report of a prompt file, or of every prompt file under a directory, as JSONL.
+
+    For a directory, the per-file records are followed by one {"shared_prefixes": [...]} record.
+    """
+    from batch import STREAM_THRESHOLD_BYTES, find_prompt_files
+
+    out = out or sys.stdout
+    analyzer = analyzer or PromptAnalyzer()
+    paths = list(find_prompt_files(path)) if os.path.isdir(path) else [path]
+    reports = []
+    for file_path in paths:
+        try:
+            if os.path.getsize(file_path) >= STREAM_THRESHOLD_BYTES:
+                record = {"path": file_path, "error": "Too large for layout analysis"}
+                out.write(json.dumps(record) + "\n")
+                continue
+            with open(file_path, encoding="utf-8", errors="replace") as f:
+                prompt = f.read().strip()
+        except OSError as e:
+            out.write(json.dumps({"path": file_path, "error": str(e)}) + "\n")
+            continue
+        report = analyze_layout(prompt, analyzer=analyzer)
+        reports.append((file_path, report))
+        record = {"path": file_path}
+        record.update(report.to_dict())
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+    if os.path.isdir(path):
+        out.write(json.dumps({"shared_prefixes": shared_prefixes(reports, min_chars=min_chars)}, ensure_ascii=False) + "\n")
+    return 0
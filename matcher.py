@@ -0,0 +1,317 @@
+"""Single-pass matcher for a table of named regex patterns.
+
+Every pattern in the table is decomposed into its top-level alternatives and
+bucketed by the first literal character of each alternative. One combined
+regex then scans the text once; it only stops on characters where some
+alternative can actually match, and each stop is confirmed against the
+original compiled patterns. The result is identical to calling
+``re.finditer`` once per pattern, without rescanning the text per pattern.
+Matches are written straight into a SpanStore in document order.
+"""
+import json
+import os
+import re
+import sys
+import unicodedata
+from array import array
+
+from spans import ID_TYPE, OFFSET_TYPE, SpanStore
+
+_REGEX_SPECIALS = set("\\[](){}.*+?^$|")
+_NEWLINE_ESCAPES = set("sWDnrvf") # Escapes that can match a line break
+_CHUNK = 1 << 15 # Line-aligned scan chunk; between chunks other threads can run
+_CASE_PROBE = None # Lazily built string of every BMP character, for case variants
+_CASE_CACHE = None # char -> case variants string, loaded from / saved to the disk cache
+
+
+def cache_dir():
+    """Directory for derived data that is expensive to recompute at startup."""
+    base = os.environ.get("PROMPT_BUILDER_CACHE")
+    if base:
+        return base
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "prompt-builder")
+
+
+def _case_cache_path():
+    # Case folding depends on the regex engine and the Unicode tables, so key on both
+    version = f"{sys.version_info[0]}.{sys.version_info[1]}-{unicodedata.unidata_version}"
+    return os.path.join(cache_dir(), f"case-variants-{version}.json")
+
+
+def _case_variants(chars):
+    """Maps each char to every character that matches it under re.IGNORECASE.
+
+    Probing the whole BMP costs tens of milliseconds, so results are kept in a
+    small JSON file under cache_dir() and only new characters are probed.
+    """
+    global _CASE_PROBE, _CASE_CACHE
+    if _CASE_CACHE is None:
+        try:
+            with open(_case_cache_path(), encoding="utf-8") as f:
+                _CASE_CACHE = json.load(f)
+        except (OSError, ValueError):
+            _CASE_CACHE = {}
+    missing = [ch for ch in chars if ch not in _CASE_CACHE]
+    if missing:
+        if _CASE_PROBE is None:
+            _CASE_PROBE = "".join(map(chr, range(0xD800))) + "".join(map(chr, range(0xE000, 0x10000)))
+        for ch in missing:
+            _CASE_CACHE[ch] = "".join(sorted(set(re.findall("(?i)" + re.escape(ch), _CASE_PROBE)) | {ch}))
+        path = _case_cache_path()
+        tmp = f"{path}.{os.getpid()}.tmp" # Batch workers may all write at once; each renames its own file
+        try:
+            os.makedirs(cache_dir(), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(_CASE_CACHE, f)
+            os.replace(tmp, path) # Readers see the old file or the new one, never half of one
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            # Read-only home, etc.: just probe again next time
+    return {ch: set(_CASE_CACHE[ch]) for ch in chars}
+
+
+def _split_top_level(body):
+    """Splits a regex body on '|' outside of groups and character classes."""
+    parts, depth, in_class, escaped, start = [], 0, False, False, 0
+    for i, ch in enumerate(body):
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+    parts.append(body[start:])
+    return parts
+
+
+def _wraps_whole(body):
+    """True if body is a single '( ... )' group spanning the whole string."""
+    if not (body.startswith("(") and body.endswith(")")) or body.startswith("(?"):
+        return False
+    depth, in_class, escaped = 0, False, False
+    for i, ch in enumerate(body):
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0 and i != len(body) - 1:
+                return False
+    return True
+
+
+def _excludes_newline(pattern, i):
+    """True if the negated class whose body starts at pattern[i] lists \\n."""
+    escaped = False
+    for j in range(i, len(pattern)):
+        ch = pattern[j]
+        if escaped:
+            if ch == "n":
+                return True
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == "\n":
+            return True
+        elif ch == "]" and j > i:
+            return False
+    return False
+
+
+def may_span_lines(pattern):
+    """Conservative check: True if the pattern could match across a line break."""
+    escaped, in_class, negated = False, False, False
+    for i, ch in enumerate(pattern):
+        if escaped:
+            if ch in _NEWLINE_ESCAPES and not negated: # Inside [^...] an escape only removes characters
+                return True
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch in "\n\r" and not negated:
+            return True
+        elif in_class:
+            in_class = ch != "]"
+            negated = negated and in_class
+        elif ch == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "^":
+                if not _excludes_newline(pattern, i + 2):
+                    return True
+                negated = True # e.g. [^\]\n]: cannot match a line break
+        elif ch == ".":
+            return True
+    return False
+
+
+def decompose(pattern):
+    """Splits a pattern into (leading_word_boundary, [(first_char, tail_regex), ...]).
+
+    Returns None if the pattern's shape is not understood; such patterns are
+    still matched exactly, just with their own scan.
+    """
+    body = pattern
+    if body.startswith("(?i)"):
+        body = body[4:]
+    lead_boundary = body.startswith(r"\b")
+    if lead_boundary:
+        body = body[2:]
+    trail = ""
+    if body.endswith(r"\b") and not body.endswith(r"\\b"):
+        body, trail = body[:-2], r"\b"
+    if _wraps_whole(body):
+        body = body[1:-1]
+    alternatives = []
+    for alt in _split_top_level(body):
+        if alt[:1] == "\\" and len(alt) > 1 and not alt[1].isalnum():
+            alt = alt[1:] # Escaped punctuation such as \[ is a literal first char
+            if len(alt) > 1 and alt[1] in "*?{":
+                return None
+            alternatives.append((alt[0], alt[1:] + trail))
+            continue
+        if not alt or alt[0] in _REGEX_SPECIALS:
+            return None
+        # A quantifier straight after the first char would make it optional
+        if len(alt) > 1 and alt[1] in "*?{":
+            return None
+        alternatives.append((alt[0], alt[1:] + trail))
+    return lead_boundary, alternatives
+
+
+class PromptMatcher:
+    """Finds every match of every named pattern in one linear pass."""
+
+    def __init__(self, patterns):
+        self.names = []
+        self.compiled = {}
+        self.fallback = [] # Patterns scanned on their own (shape not decomposable)
+        self.line_local = True # No pattern can match across a line break
+        buckets = {} # first char -> (bounded tails, unbounded tails)
+        owners = {} # first char -> [pattern name, ...] to confirm at a stop
+
+        for name, pattern in patterns.items():
+            try:
+                self.compiled[name] = re.compile(pattern)
+            except re.error as e:
+                print(f"Regex error for element '{name}': {e}") # Debugging
+                continue
+            self.names.append(name)
+            if may_span_lines(pattern):
+                self.line_local = False
+            parts = decompose(pattern)
+            if parts is None:
+                self.fallback.append(name)
+                continue
+            lead_boundary, alternatives = parts
+            for first, tail in alternatives:
+                key = first.lower()
+                bounded, unbounded = buckets.setdefault(key, ([], []))
+                (bounded if lead_boundary and (first.isalnum() or first == "_") else unbounded).append(tail)
+                if name not in owners.setdefault(key, []):
+                    owners[key].append(name)
+
+        # One branch per case variant keeps every branch a plain literal, which
+        # lets the regex engine skip straight to candidate characters.
+        branches = []
+        self._owners = {}
+        variants = _case_variants(buckets)
+        for key, (bounded, unbounded) in buckets.items():
+            checks = []
+            if bounded:
+                checks.append(r"(?<!\w.)(?i:(?=" + "|".join(f"(?:{t})" for t in bounded) + "))")
+            if unbounded:
+                checks.append("(?i:(?=" + "|".join(f"(?:{t})" for t in unbounded) + "))")
+            for ch in sorted(variants[key]):
+                branches.append(re.escape(ch) + "(?:" + "|".join(checks) + ")")
+                merged = self._owners.setdefault(ch, [])
+                merged.extend(name for name in owners[key] if name not in merged)
+        try:
+            self._scanner = re.compile("(?s)" + "|".join(branches)) if branches else None
+        except re.error:
+            # A tail that is only valid in its original context; scan everything separately
+            self._scanner = None
+            self.fallback = list(self.names)
+
+        self.names = tuple(self.names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        # Stop character -> [(pattern id, compiled pattern), ...] to confirm
+        self._owners = {ch: [(self._index[name], self.compiled[name]) for name in names]
+                        for ch, names in self._owners.items()}
+
+    def scan(self, text, start=0, end=None, checkpoint=None):
+        """Returns a SpanStore of every match, with re.finditer semantics per pattern.
+
+        start/end restrict the scan like the pos/endpos arguments of re.finditer;
+        offsets are always relative to the whole text. checkpoint, if given, is
+        called between scan chunks and may raise to abandon the scan.
+        """
+        if end is None:
+            end = len(text)
+        starts, ends, ids = array(OFFSET_TYPE), array(OFFSET_TYPE), array(ID_TYPE)
+        counts = [0] * len(self.names)
+        next_allowed = [start] * len(self.names)
+
+        if self._scanner is not None:
+            owners = self._owners
+            add_start, add_end, add_id = starts.append, ends.append, ids.append
+            chunk_start = start
+            while chunk_start < end:
+                # Matches never cross a line break, so line-aligned chunks are exact
+                chunk_end = text.find("\n", chunk_start + _CHUNK, end) if self.line_local else -1
+                if chunk_end == -1:
+                    chunk_end = end
+                for hit in self._scanner.finditer(text, chunk_start, chunk_end):
+                    pos = hit.start()
+                    for i, pattern in owners[hit.group()]:
+                        if pos < next_allowed[i]:
+                            continue
+                        match = pattern.match(text, pos, end)
+                        if match:
+                            match_end = match.end()
+                            add_start(pos)
+                            add_end(match_end)
+                            add_id(i)
+                            counts[i] += 1
+                            next_allowed[i] = match_end if match_end > pos else pos + 1
+                chunk_start = chunk_end
+                if checkpoint is not None:
+                    checkpoint()
+
+        if self.fallback:
+            rows = list(zip(starts, ids, ends))
+            for name in self.fallback:
+                i = self._index[name]
+                for match in self.compiled[name].finditer(text, start, end):
+                    rows.append((match.start(), i, match.end()))
+                    counts[i] += 1
+                if checkpoint is not None:
+                    checkpoint()
+            rows.sort(key=lambda row: row[0]) # Stable: scanner order is kept for equal starts
+            starts = array(OFFSET_TYPE, [row[0] for row in rows])
+            ends = array(OFFSET_TYPE, [row[2] for row in rows])
+            ids = array(ID_TYPE, [row[1] for row in rows])
+        return SpanStore(self.names, starts, ends, ids, counts, self._index)
+
+    def find_all(self, text, start=0, end=None, checkpoint=None):
+        """Like scan(), but returns {name: [(start, end), ...]} for every pattern."""
+        grouped = self.scan(text, start, end, checkpoint).group()
+        return {name: grouped.get(name, []) for name in self.names}
@@ -0,0 +1,166 @@
+"""Per-stage timing for the analysis pipeline and the GUI.
+
+Stages are timed with ``with stage("scan"): ...``. Timing is off by default
+and then costs a single attribute check; when enabled, every duration is
+added to a fixed-bucket histogram and a window of recent samples for
+p50/p95. ``dump`` writes everything (plus optional cProfile output) to JSON.
+"""
+import contextlib
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000) # Upper bounds
+RECENT_SAMPLES = 1000 # Samples kept per stage for percentiles
+# From 3.12 cProfile runs on sys.monitoring, which is process-wide: one profile sees every
+# thread, and enabling a second one raises ValueError
+CPROFILE_PER_THREAD = sys.version_info < (3, 12)
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class StageStats:
+    """Histogram and recent samples for one stage."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1) # Last bucket: slower than every bound
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None: # Cancelled or failed runs would skew the latencies
+            self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Collects stage timings from any thread and, optionally, cProfile data."""
+
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = False # Also run cProfile in threads that call start_cprofile()
+        self._stats = {}
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Context manager timing one run of a stage (a no-op while disabled)."""
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def record(self, name, seconds):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = StageStats()
+            stats.add(seconds * 1000)
+
+    def percentiles(self, name, qs=(50, 95)):
+        """Returns the requested percentiles (ms) of a stage's recent samples."""
+        with self._lock:
+            stats = self._stats.get(name)
+            return tuple(stats.percentile(q) if stats else 0.0 for q in qs)
+
+    def stage_names(self):
+        with self._lock:
+            return list(self._stats)
+
+    def start_cprofile(self):
+        """Starts cProfile for the calling thread if enabled; returns the profile or None.
+
+        Where one profile covers every thread (Python 3.12+), only the first
+        call starts it and later calls return the same profile.
+        """
+        if not (self.enabled and self.cprofile):
+            return None
+        import cProfile # Only loaded when asked for; it adds noticeably to startup
+        with self._lock:
+            if self._profiles and not CPROFILE_PER_THREAD:
+                return self._profiles[0]
+            profile = cProfile.Profile()
+            profile.enable()
+            self._profiles.append(profile)
+        return profile
+
+    def summary(self):
+        """Per-stage counts, latencies and histograms as plain data."""
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "mean_ms": stats.total_ms / stats.count if stats.count else 0.0,
+                    "p50_ms": stats.percentile(50),
+                    "p95_ms": stats.percentile(95),
+                    "max_ms": stats.max_ms,
+                    "histogram": {
+                        "bucket_upper_ms": list(BUCKETS_MS) + [None],
+                        "counts": list(stats.buckets),
+                    },
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def dump(self, path, top=40):
+        """Writes the stage summary (and the top cProfile entries, if any) to a JSON file."""
+        report = {"stages": self.summary()}
+        if self._profiles:
+            report["cprofile"] = self._cprofile_report(top)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    def _cprofile_report(self, top):
+        import io
+        import pstats
+        stats = None
+        for profile in self._profiles:
+            profile.disable()
+            if stats is None:
+                stats = pstats.Stats(profile, stream=io.StringIO())
+            else:
+                stats.add(profile)
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                         "tottime_ms": tottime * 1000, "cumtime_ms": cumtime * 1000})
+        rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+        return rows[:top]
+
+
+PROFILER = Profiler() # Shared by the analyzer, the worker thread and the GUI
+
+
+def stage(name):
+    """Times a stage on the shared profiler."""
+    return PROFILER.stage(name)
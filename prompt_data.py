@@ -0,0 +1,165 @@
+"""Static prompt element, technique and tip tables shared by the GUI and the analyzer."""
+
+# --- Data Extracted and Enhanced (Added 'name' field) ---
+
+PROMPT_ELEMENTS = {
+    # Name: {color, keywords_regex}
+    "Instruction": {"color": "#ADD8E6", "keywords_regex": r'(?i)\b(summarize|translate|write|explain|list|create|generate|classify|analyze|compare|define|calculate|tell me|what is|how does|why is|act as|provide|describe|identify)\b'},
+    "Context": {"color": "#90EE90", "keywords_regex": r'(?i)\b(given the context|based on this text|considering the following|with this information|background:|scenario:|context:)\b'},
+    "Input Data": {"color": "#FFFACD", "keywords_regex": r'(?i)\b(input:|data:|text:|article:|example:|document:|user query:|information:)\b'},
+    "Output Format": {"color": "#FFB6C1", "keywords_regex": r'(?i)\b(format as|output in|use bullet points|provide a json|return a list|in xml|step-by-step|in markdown|as a table|limit to|maximum|minimum)\b'},
+    "Role": {"color": "#E6E6FA", "keywords_regex": r'(?i)\b(you are a|act as a|your role is|assume the persona of)\b'},
+    "Delimiter": {"color": "#FFA07A", "keywords_regex": r'(###|---|"""|```|<[a-zA-Z_]+>|##)'}, # More generic tag pattern
+    "Example Marker": {"color": "#DAA520", "keywords_regex": r'(?i)\b(example \d+:|example:|e\.g\.:)\b'}, # Highlight examples
+    "CoT Trigger": {"color": "#FFDAB9", "keywords_regex": r'(?i)\b(let\'?s think step-by-step|think step by step|step-by-step reasoning)\b'}, # Highlight CoT triggers
+}
+
+PROMPT_TECHNIQUES_DATA = {
+    # Technique Name: {name, description, use_case, template}
+    "Zero-shot": {
+        "name": "Zero-shot",
+        "description": "Direct instruction without examples.",
+        "use_case": "Good for general tasks the LLM understands well (e.g., summarization, translation, simple Q&A).",
+        "template": "Instruction: [Clearly state the task, e.g., Summarize the following text]\n\nInput Data: [Provide the necessary information/text here]"
+    },
+    "Few-shot": {
+        "name": "Few-shot",
+        "description": "Provide 2-5 examples to show the pattern.",
+        "use_case": "Helps the LLM learn input-output patterns for specific or nuanced tasks (e.g., custom classification, style imitation, data formatting).",
+        "template": "Instruction: [State the task, e.g., Classify the sentiment of the sentence]\n\nExample 1:\nInput: [Example Input 1]\nOutput: [Example Output 1]\n\nExample 2:\nInput: [Example Input 2]\nOutput: [Example Output 2]\n\n---\n\nActual Input:\nInput Data: [Provide the actual input for the task]"
+    },
+    "CoT (Chain of Thought)": {
+        "name": "CoT (Chain of Thought)",
+        "description": "Encourage step-by-step reasoning.",
+        "use_case": "Useful for math problems, logic puzzles, multi-step reasoning, and explaining complex processes.",
+        "template": "Instruction: [State the problem/question, e.g., What is 5 * (3 + 2)?]\n\nLet's think step-by-step:"
+    },
+    "Self-consistency": {
+        "name": "Self-consistency",
+        "description": "Generate multiple reasoning paths, choose best.",
+        "use_case": "Increases reliability for arithmetic, commonsense, and symbolic reasoning tasks by sampling diverse reasoning paths.",
+        "template": "Instruction: [State the problem, e.g., Solve this riddle...]\n\nThink step-by-step through multiple possible reasoning paths and select the most consistent answer."
+    },
+    "Generate Knowledge": {
+        "name": "Generate Knowledge",
+        "description": "Prompt model to recall knowledge first.",
+        "use_case": "Useful for questions requiring factual recall or building upon existing knowledge before answering.",
+        "template": "Question: [Your main question]\n\nFirst, generate some background knowledge about [Topic related to the question].\n\nUsing that knowledge, answer the original question."
+    },
+    "Prompt Chaining": {
+        "name": "Prompt Chaining",
+        "description": "Break complex tasks into sequential prompts.",
+        "use_case": "Manages complexity, improves debuggability, allows human intervention in multi-step workflows (e.g., extract data -> analyze data -> summarize findings).",
+        "template": "# Task: [Overall Goal]\n\nStep 1 Prompt:\nInstruction: [Instruction for the first sub-task]\nInput: [Input for Step 1]\n\n---\n\nStep 2 Prompt (uses output from Step 1):\nInstruction: [Instruction for the second sub-task]\nInput: [Output from Step 1]\n\n# (Continue as needed)"
+    },
+    "Tree of Thoughts": {
+        "name": "Tree of Thoughts",
+        "description": "Explore multiple reasoning paths like a tree.",
+        "use_case": "Advanced technique for complex problem-solving where multiple possibilities need evaluation (e.g., planning, strategic games).",
+        "template": "Problem: [Describe the complex problem]\n\nExplore multiple potential solution paths or reasoning steps. Evaluate each path's viability. Select the most promising path or synthesize the best elements.\nConsider these initial branches:\n1. [Branch 1 Idea]\n2. [Branch 2 Idea]\n..."
+    },
+    "RAG (Retrieval-Augmented Generation)": {
+        "name": "RAG (Retrieval-Augmented Generation)",
+        "description": "Integrate external knowledge.",
+        "use_case": "Improves accuracy and reduces hallucination for questions based on specific documents, databases, or recent information.",
+        "template": "Context retrieved from [Source Name, e.g., Document X]:\n\"\"\"\n[Paste relevant context/text snippet here]\n\"\"\"\n\nBased *only* on the provided context, answer the following question:\nQuestion: [Your question about the context]"
+    },
+    "Directional Stimulus": {
+        "name": "Directional Stimulus",
+        "description": "Steer thinking style with a phrase.",
+        "use_case": "Controls the tone, complexity, persona, or perspective of the response (e.g., 'Explain like I'm five', 'Write in a formal tone', 'Respond as a pirate').",
+        "template": "[Guiding Phrase: e.g., Explain like I'm five / Write in the style of Shakespeare / Act as a helpful assistant]: [Your core instruction or question]"
+    },
+    "PAL (Program-Aided Language Models)": {
+        "name": "PAL (Program-Aided Language Models)",
+        "description": "Ask model to write/execute code.",
+        "use_case": "Enhances logic and mathematical accuracy for problems solvable with code (e.g., complex calculations, data manipulation).",
+        "template": "Instruction: [Describe the problem clearly, e.g., Calculate the standard deviation of these numbers: 5, 8, 12, 15]\n\nWrite [Language, e.g., Python] code to solve this. Show the code, then execute it and provide the final numerical answer."
+    },
+    "ReAct (Reason and Act)": {
+        "name": "ReAct (Reason and Act)",
+        "description": "Combine reasoning and tool use in a loop.",
+        "use_case": "Enables agents to perform dynamic multi-step tasks involving external tools (search, calculators, APIs) by reasoning, acting, and observing.",
+        "template": "Goal: [State the overall objective, e.g., Find the current weather in London and the capital of France]\n\nThought: I need to find the weather in London first. I can use a search tool.\nAction: Search('current weather in London')\nObservation: [Result from search, e.g., 15°C, cloudy]\nThought: Now I need the capital of France. I can use search again.\nAction: Search('capital of France')\nObservation: [Result from search, e.g., Paris]\nThought: I have both pieces of information.\nFinal Answer: The current weather in London is 15°C and cloudy. The capital of France is Paris."
+    },
+     "Meta Prompting": {
+        "name": "Meta Prompting",
+        "description": "Ask the model to help create/refine prompts.",
+        "use_case": "Useful for generating prompt ideas, improving existing prompts, or selecting the best prompt for a task.",
+        "template": "Task: [Describe the task you want a prompt for, e.g., Summarize scientific papers]\n\nGenerate 3 effective prompts an LLM could use to accomplish this task. Explain why each prompt is good."
+     },
+     "Graph Prompting": {
+        "name": "Graph Prompting",
+        "description": "Use graph structures for logic/relationships.",
+        "use_case": "Excellent for reasoning about relationships, dependencies, or paths in structured data (e.g., social networks, flowcharts, knowledge graphs).",
+        "template": "Consider the following relationships represented as a graph:\nNodes: [List nodes, e.g., A, B, C, D]\nEdges: [List connections, e.g., A -> B, B -> C, A -> D]\n\nQuestion: [Ask a question about the graph, e.g., What is the shortest path from A to C?]"
+     }
+    # Add more techniques from the document as needed
+}
+
+GENERAL_TIPS = {
+    "Be Specific": "Clearly define the task, desired output, and any constraints. Avoid ambiguity.",
+    "Use Action Verbs": "Start instructions with clear verbs like 'Summarize', 'Generate', 'Translate', 'Analyze'.",
+    "Structure Input/Output": "Use delimiters (###, ```), Markdown, JSON, or XML for clarity, especially with complex inputs or multiple parts.",
+    "Provide Context": "Give necessary background information, especially if the task requires domain knowledge or specific scenario understanding.",
+    "Avoid Negations": "Instead of 'Don't use jargon', say 'Explain in simple terms'. State the desired outcome positively.",
+    "Break Down Tasks": "For complex goals, use Prompt Chaining or outline steps clearly within a single prompt.",
+    "Consider Role Playing": "Use 'Act as a...' (Role element) to set a persona or expertise level (Directional Stimulus).",
+    "Specify Constraints": "Define length limits, tone, style, or information to include/exclude (Output Format).",
+    "Iterate and Refine": "Prompting is often iterative; test results and adjust your prompt based on the output.",
+}
+
+# --- Suggestion Rules ---
+# A rule fires when any of its "when" clauses holds; a clause is a list of facts
+# that must all hold. Facts are element names ("Instruction"), analysis_details
+# keys ("few_shot_structure_detected"), matcher checks ("negation", "reasoning"),
+# case-insensitive substrings ("kw:document"), word-count bounds ("length<10")
+# and "empty". Prefix a fact with "!" to require its absence.
+
+SUGGESTION_RULES = [
+    # id: {text, detail, when, optional exclusive/suppresses}
+    {"id": "empty_prompt", "exclusive": True, # Only suggestion shown for an empty prompt
+     "text": "[INFO] Start by typing or loading a template.",
+     "detail": "The input area is empty. Type your prompt or select a template from the dropdown above.",
+     "when": [["empty"]]},
+    {"id": "missing_instruction", "suppresses": ["Be Specific", "Use Action Verbs"],
+     "text": "[!] Add Clear Instruction",
+     "detail": "Missing Instruction:\n\nClearly state the main task using action verbs (e.g., 'Summarize', 'Explain', 'Generate'). This is crucial for the LLM to understand the goal.",
+     "when": [["!Instruction"]]},
+    {"id": "more_detail",
+     "text": "[TIP] Consider More Detail/Context",
+     "detail": "Brief Prompt:\n\nIf the task is complex or requires specific background, consider adding more context, details, constraints, or examples.",
+     "when": [["length<10", "!few_shot_structure_detected"]]},
+    {"id": "rephrase_negations", "suppresses": ["Avoid Negations"],
+     "text": "[TIP] Rephrase Negations Positively",
+     "detail": "Avoid Negations:\n\nInstead of saying what *not* to do (e.g., 'don't be vague'), state the desired outcome positively (e.g., 'be specific and detailed'). This is usually clearer for the LLM.",
+     "when": [["negation"]]},
+    {"id": "output_format",
+     "text": "[TIP] Specify Output Format?",
+     "detail": "Consider Output Format:\n\nFor clearer results, especially with complex outputs, explicitly state the desired format (e.g., 'Format as a JSON object with keys X and Y', 'Use bullet points for the main ideas', 'Create a markdown table with columns A, B, C').",
+     "when": [["!Output Format", "length>20"]]}, # Suggest if reasonably long
+    {"id": "use_delimiters", "suppresses": ["Structure Input/Output"],
+     "text": "[TIP] Use Delimiters for Structure?",
+     "detail": "Consider Delimiters:\n\nFor prompts with multiple distinct parts (instructions, context, examples, input), using delimiters like '###', '---', or ``` can improve clarity and help the LLM parse the sections correctly.",
+     "when": [["!Delimiter", "length>30", "examples_found"],
+              ["!Delimiter", "length>30", "Context"],
+              ["!Delimiter", "length>30", "Input Data"]]},
+]
+
+TECHNIQUE_RULES = [
+    # Detected structure: always suggested
+    {"technique": "Few-shot", "structural": True, "when": [["few_shot_structure_detected"]]},
+    {"technique": "CoT (Chain of Thought)", "structural": True, "when": [["cot_structure_detected"]]},
+    {"technique": "RAG (Retrieval-Augmented Generation)", "structural": True, "when": [["rag_structure_detected"]]},
+    # Keyword hints: only used if no structure was detected
+    {"technique": "Few-shot", "when": [["kw:example", "kw:input", "kw:output"]]},
+    {"technique": "CoT (Chain of Thought)", "when": [["kw:step-by-step"], ["reasoning"]]},
+    {"technique": "RAG (Retrieval-Augmented Generation)", "when": [["kw:context", "kw:question"], ["kw:document"], ["kw:based on"]]},
+    {"technique": "Directional Stimulus", "when": [["kw:act as"], ["kw:you are a"], ["kw:style of"], ["kw:explain like i'm"]]},
+    {"technique": "PAL (Program-Aided Language Models)", "when": [["kw:code"], ["kw:python"], ["kw:javascript"], ["kw:function"]]},
+    # Also covers detected ReAct cycles (react_structure_detected); kept out of the structural
+    # set so a ReAct prompt still gets the other keyword hints
+    {"technique": "ReAct (Reason and Act)", "when": [["kw:thought:", "kw:action:", "kw:observation:"]]},
+]
+
+MAX_SUGGESTIONS = 5 # General tips only fill the list up to this many entries
@@ -0,0 +1,110 @@
+"""Declarative suggestion rules evaluated against a per-analysis fact index.
+
+The rule tables live in prompt_data.py. They are compiled once into plain
+set/integer checks; each analysis then builds one set of facts from the
+matcher's results and analysis_details, and every rule is a few set
+operations against it. Adding a rule adds data, not another pass over the text.
+"""
+import re
+
+_LENGTH_FACT = re.compile(r"^length([<>])(\d+)$")
+KEYWORD_PREFIX = "kw:" # Facts that are case-insensitive substrings of the prompt
+
+
+def _compile_clause(facts):
+    """Turns ["!Delimiter", "length>30", "Context"] into (required, forbidden, min_length, max_length)."""
+    required, forbidden = set(), set()
+    min_length, max_length = None, None
+    for fact in facts:
+        length = _LENGTH_FACT.match(fact)
+        if length:
+            bound = int(length.group(2))
+            if length.group(1) == ">":
+                min_length = bound if min_length is None else max(min_length, bound)
+            else:
+                max_length = bound if max_length is None else min(max_length, bound)
+        elif fact.startswith("!"):
+            forbidden.add(fact[1:])
+        else:
+            required.add(fact)
+    return frozenset(required), frozenset(forbidden), min_length, max_length
+
+
+def _holds(clauses, facts, length):
+    for required, forbidden, min_length, max_length in clauses:
+        if (required <= facts and facts.isdisjoint(forbidden)
+                and (min_length is None or length > min_length)
+                and (max_length is None or length < max_length)):
+            return True
+    return False
+
+
+class RuleSet:
+    """Compiled suggestion, technique and general-tip rules."""
+
+    def __init__(self, suggestion_rules, technique_rules, techniques, general_tips, max_suggestions=5):
+        self.suggestions = [(rule["text"], rule["detail"], rule.get("exclusive", False),
+                             tuple(rule.get("suppresses", ())),
+                             tuple(_compile_clause(clause) for clause in rule["when"]))
+                            for rule in suggestion_rules]
+        # Techniques missing from the technique table are skipped, as before
+        self.techniques = [(rule["technique"], rule.get("structural", False),
+                            tuple(_compile_clause(clause) for clause in rule["when"]))
+                           for rule in technique_rules if rule["technique"] in techniques]
+        self.technique_details = {
+            name: f"TECHNIQUE: {data['name']}\n\n{data['description']}\n\nUse Case ({data['name']}): {data['use_case']}"
+            for name, data in techniques.items()
+        }
+        self.general_tips = [(f"[GENERAL TIP] {key}", f"GENERAL TIP: {key}\n\n{tip}", key)
+                             for key, tip in general_tips.items()]
+        self.max_suggestions = max_suggestions
+
+        names = set()
+        for rule in list(suggestion_rules) + list(technique_rules):
+            for clause in rule["when"]:
+                names.update(fact.lstrip("!") for fact in clause if not _LENGTH_FACT.match(fact))
+        self.fact_names = frozenset(names) # Every fact any rule refers to
+
+    def keywords(self):
+        """Substrings the rules refer to, e.g. {"document", "based on"}."""
+        return sorted(name[len(KEYWORD_PREFIX):] for name in self.fact_names if name.startswith(KEYWORD_PREFIX))
+
+    def facts(self, prompt, found_elements, analysis_details, counts):
+        """Builds the fact index for one analysis; counts maps pattern names to match counts."""
+        facts = set(found_elements)
+        facts.update(key for key, value in analysis_details.items() if value)
+        facts.update(name for name in self.fact_names if counts.get(name))
+        if not prompt:
+            facts.add("empty")
+        return facts
+
+    def evaluate(self, facts, length):
+        """Returns the ordered list of (suggestion_text, detail_text) pairs."""
+        suggestions = []
+        suppressed = set()
+        for text, detail, exclusive, suppresses, clauses in self.suggestions:
+            if _holds(clauses, facts, length):
+                if exclusive:
+                    return [(text, detail)]
+                suggestions.append((text, detail))
+                suppressed.update(suppresses)
+
+        # --- Suggest Techniques Based on Detected Structure/Keywords ---
+        structural = {name for name, is_structural, clauses in self.techniques
+                      if is_structural and _holds(clauses, facts, length)}
+        # Keyword hints only apply if no structure was detected
+        suggested = structural or {name for name, is_structural, clauses in self.techniques
+                                   if not is_structural and _holds(clauses, facts, length)}
+        for name in sorted(suggested): # Sort for consistency
+            suggestions.append((f"[TECHNIQUE] Consider {name}", self.technique_details[name]))
+
+        # --- Add General Tips --- only to fill up the list, skipping tips already covered
+        room = max(0, self.max_suggestions - len(suggestions))
+        for text, detail, key in self.general_tips:
+            if room <= 0:
+                break
+            if key in suppressed:
+                continue
+            suggestions.append((text, detail))
+            room -= 1
+        return suggestions
@@ -0,0 +1,306 @@
+"""Long-running analysis server for editor integrations.
+
+Speaks JSON-RPC 2.0 with LSP-style ``Content-Length`` framing, over stdio or a
+Unix socket. The compiled matcher, rule tables and result cache are built once
+and shared by every client. Each open document keeps its own
+IncrementalAnalyzer, so edits only rescan the lines they touch.
+
+Methods (requests carry an "id", notifications do not):
+
+    initialize                {capabilities}                       -> capabilities
+    textDocument/didOpen      {textDocument: {uri, text, version}}
+    textDocument/didChange    {textDocument: {uri, version}, contentChanges: [{text} | {range, text}]}
+    textDocument/didClose     {textDocument: {uri}}
+    prompt/analyze            {uri} or {text}                      -> analysis
+    shutdown / exit
+
+An analysis is AnalysisResult.to_dict() plus the document "version".
+Positions are {line, character}. Characters are counted in code points
+("utf-32") if the client offers that position encoding in initialize, and in
+UTF-16 code units (the LSP default) otherwise. Span offsets are always code
+point offsets. As in batch mode, leading and trailing whitespace is stripped
+before analysis; span offsets still refer to the text as sent.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+
+from analyzer import PromptAnalyzer
+from cache import AnalysisCache
+from highlight import LineIndex
+from incremental import IncrementalAnalyzer
+
+SERVER_NAME = "prompt-builder"
+EXECUTOR_THRESHOLD = 256 * 1024 # Characters; longer documents are analysed off the event loop
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+DEFAULT_ENCODING = "utf-16" # LSP position encoding when the client offers nothing better
+
+
+class RequestError(Exception):
+    """A JSON-RPC error returned to the client."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def _text(value, field):
+    """Returns value if it is a string; anything else is rejected before it reaches the matcher."""
+    if not isinstance(value, str):
+        raise RequestError(INVALID_PARAMS, f"{field} must be a string")
+    return value
+
+
+class Document:
+    """An open editor buffer and its incremental analysis state."""
+
+    def __init__(self, text, version, analyzer, cache):
+        self.text = text
+        self.version = version
+        self.incremental = IncrementalAnalyzer(analyzer, cache=cache)
+
+    def apply(self, change, encoding=DEFAULT_ENCODING):
+        """Applies one LSP content change (whole text, or a range replacement)."""
+        text = _text(change["text"], "contentChanges.text")
+        if "range" not in change:
+            self.text = text
+            return
+        starts = LineIndex(self.text).starts
+        start = _offset(self.text, starts, change["range"]["start"], encoding)
+        end = _offset(self.text, starts, change["range"]["end"], encoding)
+        self.text = self.text[:start] + text + self.text[end:]
+
+
+def _offset(text, starts, position, encoding):
+    line = position["line"]
+    if line >= len(starts) - 1: # Past the last line: clamp to the end of the text
+        return len(text)
+    character = position["character"]
+    if encoding == "utf-16":
+        character = _utf16_points(text, starts[line], character)
+    return min(starts[line] + character, starts[line + 1] - 1, len(text))
+
+
+def _utf16_points(text, start, units):
+    """Number of code points from start that take up units UTF-16 code units."""
+    if max(text[start:start + units], default="") <= "\uffff": # No surrogate pairs: units are code points
+        return units
+    points = 0
+    for ch in text[start:start + units]:
+        if units <= 0:
+            break
+        units -= 2 if ch > "\uffff" else 1 # Astral characters are a surrogate pair
+        points += 1
+    return points
+
+
+def _stripped(text):
+    """Returns (text as batch mode analyses it, offset of that text in the original)."""
+    stripped = text.strip()
+    return stripped, (len(text) - len(text.lstrip()) if stripped else 0)
+
+
+def _response(result, lead):
+    """result.to_dict() with span offsets moved back onto the unstripped text."""
+    response = result.to_dict()
+    if lead:
+        response["spans"] = [[element, start + lead, end + lead] for element, start, end in response["spans"]]
+    return response
+
+
+class Session(dict):
+    """One client's open documents (uri -> Document) and negotiated position encoding."""
+
+    encoding = DEFAULT_ENCODING
+
+
+async def read_message(reader):
+    """Reads one framed JSON message; returns None at end of stream."""
+    length = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is None:
+                continue # Stray blank line between messages
+            break
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length)
+    return json.loads(body)
+
+
+def write_message(writer, message):
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    writer.write(b"Content-Length: %d\r\n\r\n" % len(data) + data)
+
+
+class AnalysisServer:
+    """Shares one warm analyzer and cache between any number of client sessions."""
+
+    def __init__(self, analyzer=None, cache_mb=64):
+        self.analyzer = analyzer or PromptAnalyzer()
+        self.cache = AnalysisCache(max_bytes=cache_mb * 1024 * 1024)
+        self.sessions = 0
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await self.session(reader, writer)
+
+    async def serve_unix(self, path):
+        if os.path.exists(path):
+            os.unlink(path) # Stale socket from a previous run
+        server = await asyncio.start_unix_server(self.session, path=path)
+        print(f"Listening on {path}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    async def session(self, reader, writer):
+        """Handles one client until it sends "exit" or disconnects.
+
+        Messages from one client are handled in order, so an edit is always
+        applied before a later analyze request; clients run concurrently.
+        Documents belong to the session that opened them.
+        """
+        self.sessions += 1
+        documents = Session()
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except (ValueError, TypeError) as e:
+                    write_message(writer, {"jsonrpc": "2.0", "id": None,
+                                           "error": {"code": PARSE_ERROR, "message": str(e)}})
+                    continue
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if message is None or (isinstance(message, dict) and message.get("method") == "exit"):
+                    break
+                response = await self.dispatch(message, documents)
+                if response is not None:
+                    write_message(writer, response)
+                    await writer.drain()
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def dispatch(self, message, documents):
+        """Runs one request or notification; returns the response, or None for notifications."""
+        request_id = message.get("id") if isinstance(message, dict) else None
+        try:
+            if not isinstance(message, dict) or "method" not in message:
+                raise RequestError(INVALID_REQUEST, "Missing method")
+            handler = self.METHODS.get(message["method"])
+            if handler is None:
+                raise RequestError(METHOD_NOT_FOUND, f"Unknown method: {message['method']}")
+            result = await handler(self, message.get("params") or {}, documents)
+        except RequestError as e:
+            error = {"code": e.code, "message": str(e)}
+            return None if request_id is None else {"jsonrpc": "2.0", "id": request_id, "error": error}
+        except (KeyError, TypeError, ValueError) as e:
+            error = {"code": INVALID_PARAMS, "message": f"Invalid params: {e}"}
+            return None if request_id is None else {"jsonrpc": "2.0", "id": request_id, "error": error}
+        except Exception as e: # Last resort: one bad request must not take the server down
+            print(f"Internal error in {message.get('method')}: {e!r}", file=sys.stderr) # Debugging
+            error = {"code": INTERNAL_ERROR, "message": f"Internal error: {e}"}
+            return None if request_id is None else {"jsonrpc": "2.0", "id": request_id, "error": error}
+        if request_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    # --- Methods ---
+
+    async def initialize(self, params, documents):
+        offered = ((params.get("capabilities") or {}).get("general") or {}).get("positionEncodings") or ()
+        documents.encoding = "utf-32" if "utf-32" in offered else DEFAULT_ENCODING # Offsets are code points
+        return {
+            "capabilities": {"positionEncoding": documents.encoding, "textDocumentSync": 2}, # 2 = incremental
+            "serverInfo": {"name": SERVER_NAME},
+        }
+
+    async def shutdown(self, params, documents):
+        return None
+
+    async def did_open(self, params, documents):
+        doc = params["textDocument"]
+        documents[doc["uri"]] = Document(_text(doc["text"], "textDocument.text"), doc.get("version"),
+                                         self.analyzer, self.cache)
+
+    async def did_change(self, params, documents):
+        doc = params["textDocument"]
+        document = documents.get(doc["uri"])
+        if document is None:
+            raise RequestError(INVALID_PARAMS, f"Document not open: {doc['uri']}")
+        for change in params["contentChanges"]:
+            document.apply(change, documents.encoding)
+        document.version = doc.get("version", document.version)
+
+    async def did_close(self, params, documents):
+        documents.pop(params["textDocument"]["uri"], None)
+
+    async def analyze(self, params, documents):
+        if "text" in params:
+            text, lead = _stripped(_text(params["text"], "text"))
+            if len(text) < EXECUTOR_THRESHOLD:
+                return _response(self.analyzer.analyze(text), lead)
+            result = await asyncio.get_running_loop().run_in_executor(None, self.analyzer.analyze, text)
+            return _response(result, lead)
+
+        document = documents.get(params["uri"])
+        if document is None:
+            raise RequestError(INVALID_PARAMS, f"Document not open: {params['uri']}")
+        text, lead = _stripped(document.text)
+        # Safe off the loop: this session handles nothing else until the analysis returns
+        if len(text) < EXECUTOR_THRESHOLD:
+            result = document.incremental.update(text)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(None, document.incremental.update, text)
+        response = _response(result, lead)
+        response["version"] = document.version
+        return response
+
+    METHODS = {
+        "initialize": initialize,
+        "shutdown": shutdown,
+        "textDocument/didOpen": did_open,
+        "textDocument/didChange": did_change,
+        "textDocument/didClose": did_close,
+        "prompt/analyze": analyze,
+    }
+
+
+def run_server(socket_path=None, cache_mb=64):
+    """Serves over a Unix socket if a path is given, otherwise over stdio."""
+    server = AnalysisServer(cache_mb=cache_mb)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0)) # Still runs the cleanup below
+    try:
+        asyncio.run(server.serve_unix(socket_path) if socket_path else server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt analysis server (JSON-RPC over stdio or a Unix socket)")
+    parser.add_argument("--socket", metavar="PATH", help="Listen on a Unix socket instead of stdio.")
+    parser.add_argument("--cache-mb", type=int, default=64, help="Memory cap for cached analysis results in MB.")
+    args = parser.parse_args()
+    run_server(args.socket, args.cache_mb)
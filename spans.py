@@ -0,0 +1,113 @@
+"""Compact, array-backed storage for the matches of one analysis.
+
+A SpanStore keeps every match in three typed arrays: start offset, end offset
+and a pattern id, in document order (sorted by start). That is about ten bytes
+per match instead of a tuple in a list per pattern, so millions of matches fit
+comfortably. Range queries are a bisect on the start column, per-pattern counts
+are kept alongside, and highlighting, section detection, suggestions and export
+all read from the same store.
+"""
+from array import array
+from bisect import bisect_left
+
+OFFSET_TYPE = "I" if array("I").itemsize >= 4 else "L" # Unsigned, at least 32 bits
+ID_TYPE = "H"
+
+
+class SpanStore:
+    """Matches as parallel (starts, ends, ids) arrays sorted by start offset."""
+
+    __slots__ = ("names", "starts", "ends", "ids", "_counts", "_index")
+
+    def __init__(self, names, starts=None, ends=None, ids=None, counts=None, index=None):
+        self.names = names # Tuple of pattern names; ids index into it
+        self._index = index if index is not None else {name: i for i, name in enumerate(names)}
+        self.starts = starts if starts is not None else array(OFFSET_TYPE)
+        self.ends = ends if ends is not None else array(OFFSET_TYPE)
+        self.ids = ids if ids is not None else array(ID_TYPE)
+        if counts is None:
+            counts = [self.ids.count(i) for i in range(len(names))]
+        self._counts = counts # Matches per id
+
+    @classmethod
+    def from_matches(cls, names, matches):
+        """Builds a store from {name: [(start, end), ...]}; names fixes the id order."""
+        names = tuple(names)
+        rows = sorted((start, i, end) for i, name in enumerate(names) for start, end in matches.get(name, ()))
+        return cls(names,
+                   array(OFFSET_TYPE, [row[0] for row in rows]),
+                   array(OFFSET_TYPE, [row[2] for row in rows]),
+                   array(ID_TYPE, [row[1] for row in rows]))
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def nbytes(self):
+        """Bytes used by the span columns."""
+        return sum(column.itemsize * len(column) for column in (self.starts, self.ends, self.ids))
+
+    def count(self, name):
+        i = self._index.get(name)
+        return 0 if i is None else self._counts[i]
+
+    def counts(self):
+        """{name: number of matches} for every pattern."""
+        return dict(zip(self.names, self._counts))
+
+    def bounds(self, start=0, end=None):
+        """Row range [lo, hi) of the matches starting in [start, end)."""
+        lo = bisect_left(self.starts, start) if start else 0
+        hi = len(self.starts) if end is None else bisect_left(self.starts, end, lo)
+        return lo, hi
+
+    def _wanted(self, names):
+        if names is None:
+            return None
+        return {self._index[name] for name in names if name in self._index}
+
+    def iter_spans(self, names=None, start=0, end=None):
+        """Yields (start, end, name) in document order, optionally filtered by name and start offset."""
+        lo, hi = self.bounds(start, end)
+        starts, ends, ids, all_names = self.starts, self.ends, self.ids, self.names
+        wanted = self._wanted(names)
+        for row in range(lo, hi):
+            i = ids[row]
+            if wanted is None or i in wanted:
+                yield starts[row], ends[row], all_names[i]
+
+    def group(self, names=None, start=0, end=None):
+        """Returns {name: [(start, end), ...]} for the matches starting in [start, end)."""
+        lo, hi = self.bounds(start, end)
+        wanted = self._wanted(names)
+        ids = self.ids
+        grouped = {}
+        for s, e, i in zip(self.starts[lo:hi], self.ends[lo:hi], ids[lo:hi]):
+            if wanted is None or i in wanted:
+                spans = grouped.get(i)
+                if spans is None:
+                    spans = grouped[i] = []
+                spans.append((s, e))
+        return {self.names[i]: spans for i, spans in grouped.items()}
+
+    def splice(self, start, old_end, delta, fresh):
+        """Returns a new store with the matches starting in [start, old_end) replaced by fresh.
+
+        Matches at or after old_end are shifted by delta; fresh (a store over the
+        same names) must already use offsets in the new text.
+        """
+        lo, hi = self.bounds(start, old_end)
+        counts = list(self._counts)
+        for i in self.ids[lo:hi]:
+            counts[i] -= 1
+        for i, count in enumerate(fresh._counts):
+            counts[i] += count
+        tail_starts, tail_ends = self.starts[hi:], self.ends[hi:]
+        if delta:
+            tail_starts = array(OFFSET_TYPE, [s + delta for s in tail_starts])
+            tail_ends = array(OFFSET_TYPE, [e + delta for e in tail_ends])
+        return SpanStore(self.names,
+                         self.starts[:lo] + fresh.starts + tail_starts,
+                         self.ends[:lo] + fresh.ends + tail_ends,
+                         self.ids[:lo] + fresh.ids + self.ids[hi:],
+                         counts, self._index)
@@ -0,0 +1,185 @@
+"""Bounded-memory analysis of prompt/context files too large to load as a string.
+
+The file is memory-mapped and scanned in chunks of about CHUNK_BYTES. Each
+chunk is decoded together with OVERLAP_BYTES of context on either side, so
+lookbehinds and matches that run past the chunk end see the same text they
+would in a full scan; a match is only counted by the chunk it starts in.
+Chunks end on a line break where possible, which makes the counts exact for
+line-local patterns (the default element table). A chunk cut inside a very
+long line is exact as long as no match is longer than the overlap: a pattern
+whose last match ran past the cut is resumed from that match's end with its
+own compiled regex, exactly where re.finditer would continue. Only
+per-pattern counts and the section state machines are kept between chunks,
+never the spans.
+"""
+import mmap
+import os
+
+from analyzer import PromptAnalyzer
+from structure import SectionDetector
+from tokens import BLOCK_SPLIT_RE
+
+CHUNK_BYTES = 1024 * 1024 # Bytes scanned per step
+OVERLAP_BYTES = 4096 # Context decoded on each side of a chunk
+LINE_SEARCH_BYTES = 1024 * 1024 # How far past CHUNK_BYTES to look for a line break
+PAGE_BYTES = 64 * 1024 # Size of one preview page
+TOKEN_TAIL_CHARS = 1024 * 1024 # Longest unfinished block carried over to the next chunk's token count
+
+
+class StreamSummary:
+    """Running (or final) analysis of a file scanned chunk by chunk."""
+
+    def __init__(self, path, size, scanned, counts, found_elements, analysis_details, suggestions, done):
+        self.path = path
+        self.size = size # File size in bytes
+        self.scanned = scanned # Bytes analysed so far
+        self.counts = counts # {element: match count}
+        self.found_elements = found_elements
+        self.analysis_details = analysis_details
+        self.suggestions = suggestions # List of (suggestion_text, detail_text)
+        self.done = done
+
+    def to_dict(self):
+        """JSON-serialisable view, in the shape of AnalysisResult.to_dict() minus the spans."""
+        return {
+            "path": self.path,
+            "size": self.size,
+            "scanned": self.scanned,
+            "done": self.done,
+            "element_counts": self.counts,
+            "found_elements": sorted(self.found_elements),
+            "analysis_details": self.analysis_details,
+            "suggestions": [{"text": text, "detail": detail} for text, detail in self.suggestions],
+        }
+
+
+def _char_boundary(data, pos):
+    """Moves pos back to the start of a UTF-8 character."""
+    while 0 < pos < len(data) and data[pos] & 0xC0 == 0x80:
+        pos -= 1
+    return pos
+
+
+def _chunk_end(data, start, chunk_bytes):
+    """End of the chunk starting at start: just after a line break if one is near."""
+    size = len(data)
+    if start + chunk_bytes >= size:
+        return size, True
+    newline = data.find(b"\n", start + chunk_bytes, min(size, start + chunk_bytes + LINE_SEARCH_BYTES))
+    if newline != -1:
+        return newline + 1, True
+    end = _char_boundary(data, start + chunk_bytes)
+    while end <= start or (end < size and data[end] & 0xC0 == 0x80): # Chunk smaller than one character
+        end += 1
+    return end, False
+
+
+def _decode(data, start, end):
+    return data[start:end].decode("utf-8", errors="replace")
+
+
+def iter_analysis(path, analyzer=None, chunk_bytes=CHUNK_BYTES, overlap=OVERLAP_BYTES, checkpoint=None):
+    """Yields a StreamSummary after every chunk of the file; the last one has done=True.
+
+    checkpoint, if given, is called between scan steps and may raise to stop.
+    """
+    analyzer = analyzer or PromptAnalyzer()
+    matcher = analyzer.matcher
+    size = os.path.getsize(path)
+    counts = dict.fromkeys(matcher.names, 0)
+    sections = SectionDetector()
+    word_count = 0
+    tokens = 0 # Tokens of the complete blocks so far (see tokens.py)
+    token_tail = "" # Trailing block of the chunks so far, counted once it is complete
+    empty = True
+
+    def summary(scanned, done):
+        found_elements, analysis_details = analyzer.summarize(word_count, counts, sections=dict(sections.counts),
+                                                               tokens=tokens + analyzer.tokens.count(token_tail))
+        # Rules only test whether the prompt is empty, so the path stands in for the text
+        suggestions = analyzer.suggest("" if empty else path, found_elements, analysis_details, counts)
+        element_counts = {element: counts[element] for element in analyzer.elements if counts.get(element)}
+        return StreamSummary(path, size, scanned, element_counts, found_elements, analysis_details, suggestions, done)
+
+    if size == 0: # mmap cannot map an empty file
+        yield summary(0, True)
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        chars_before = 0 # Characters decoded before the current chunk
+        next_allowed = dict.fromkeys(matcher.names, 0) # Global offset each pattern may match from
+        previous_tail = " "
+        while start < size:
+            end, at_line_break = _chunk_end(data, start, chunk_bytes)
+            before = _decode(data, _char_boundary(data, max(0, start - overlap)), start)
+            body = _decode(data, start, end)
+            # A chunk ending on a line break needs no lookahead for line-local patterns
+            after_end = end if at_line_break and matcher.line_local else _char_boundary(data, min(size, end + overlap))
+            window = before + body + _decode(data, end, after_end)
+
+            lead, body_end = len(before), len(before) + len(body)
+            shift = chars_before - lead # Window offset -> offset in the whole file
+            # Patterns whose last match ran into this chunk must resume where it ended, as
+            # re.finditer would; a scan from the chunk start could align its matches differently
+            carried = [name for name in matcher.names if next_allowed[name] > chars_before]
+            markers = []
+
+            def count(s, e, name):
+                counts[name] += 1
+                next_allowed[name] = e if e > s else s + 1
+                if name in sections.roles:
+                    markers.append((s, e, name))
+
+            for s, e, name in matcher.scan(window, lead, checkpoint=checkpoint).iter_spans(end=body_end):
+                if name not in carried:
+                    count(s + shift, e + shift, name)
+            for name in carried:
+                for match in matcher.compiled[name].finditer(window, next_allowed[name] - shift):
+                    if match.start() >= body_end:
+                        break
+                    count(match.start() + shift, match.end() + shift, name)
+            if carried:
+                markers.sort(key=lambda marker: marker[0]) # Stable, like the scan's own order
+            sections.feed(markers)
+
+            words = body.split()
+            word_count += len(words)
+            if words and not previous_tail.isspace() and not body[0].isspace():
+                word_count -= 1 # One word split across the chunk boundary
+            if body:
+                previous_tail = body[-1]
+            empty = empty and not words
+            blocks = BLOCK_SPLIT_RE.split(token_tail + body)
+            token_tail = blocks.pop()
+            tokens += sum(map(analyzer.tokens.count_block, blocks))
+            if len(token_tail) > TOKEN_TAIL_CHARS: # No block boundary for a long stretch: count it as is
+                tokens += analyzer.tokens.count_block(token_tail)
+                token_tail = ""
+
+            chars_before += len(body)
+            start = end
+            yield summary(end, end >= size)
+
+
+def analyze_path(path, analyzer=None, chunk_bytes=CHUNK_BYTES, overlap=OVERLAP_BYTES, checkpoint=None):
+    """Analyses a file of any size with bounded memory; returns the final StreamSummary."""
+    result = None
+    for result in iter_analysis(path, analyzer, chunk_bytes, overlap, checkpoint):
+        pass
+    return result
+
+
+def page_count(path, page_bytes=PAGE_BYTES):
+    return max(1, -(-os.path.getsize(path) // page_bytes))
+
+
+def read_page(path, page, page_bytes=PAGE_BYTES):
+    """Decoded text of one preview page (page_bytes-sized, snapped to UTF-8 characters)."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return ""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = _char_boundary(data, min(size, page * page_bytes))
+        end = _char_boundary(data, min(size, (page + 1) * page_bytes))
+        return _decode(data, start, end)
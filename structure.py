@@ -0,0 +1,58 @@
+"""Linear-time detection of ordered prompt sections.
+
+A section pattern is an ordered sequence of marker names, e.g. Thought ->
+Action -> Observation. The marker spans are read from the SpanStore in
+document order and fed through one small state machine per pattern, so
+the cost is linear in the number of markers no matter how the text is laid
+out (unlike a DOTALL ``a.*b`` regex, which backtracks across the document).
+"""
+# Pattern name -> ordered marker names (keys of the matcher's pattern table)
+SECTION_PATTERNS = {
+    "rag": ("rag_context", "rag_question"), # Context first, then the question
+    "input_output": ("io_input", "io_output"), # Input/Output example pairs
+    "react": ("react_thought", "react_action", "react_observation"), # ReAct cycles
+}
+
+
+class SectionDetector:
+    """Counts completed, non-overlapping occurrences of each section pattern.
+
+    Each marker must start at or after the end of the previous marker in the
+    sequence. Seeing the first marker again restarts the sequence, so
+    "Thought, Thought, Action, Observation" is one cycle. Markers can be fed
+    in several batches (e.g. one per file chunk) as long as every batch comes
+    after the previous one in the document.
+    """
+
+    def __init__(self, patterns=SECTION_PATTERNS):
+        self.patterns = patterns
+        self.roles = {} # marker name -> [(pattern, position in sequence), ...]
+        for pattern, sequence in patterns.items():
+            for position, marker in enumerate(sequence):
+                self.roles.setdefault(marker, []).append((pattern, position))
+        self.counts = dict.fromkeys(patterns, 0)
+        self.state = dict.fromkeys(patterns, 0) # Index of the next expected marker
+        self.last_end = dict.fromkeys(patterns, 0) # End of the last accepted marker
+
+    def feed(self, markers):
+        """Advances every pattern over (start, end, marker name) tuples in document order."""
+        patterns, roles, counts, state, last_end = self.patterns, self.roles, self.counts, self.state, self.last_end
+        for start, end, marker in markers:
+            for pattern, position in roles.get(marker, ()):
+                if len(patterns[pattern]) == 1:
+                    counts[pattern] += 1 # A one-marker pattern completes as soon as it is seen
+                elif position == 0:
+                    state[pattern], last_end[pattern] = 1, end
+                elif position == state[pattern] and start >= last_end[pattern]:
+                    if position == len(patterns[pattern]) - 1:
+                        counts[pattern] += 1
+                        state[pattern] = 0
+                    else:
+                        state[pattern], last_end[pattern] = position + 1, end
+        return counts
+
+
+def detect_sections(store, patterns=SECTION_PATTERNS):
+    """Counts of each section pattern in one document's SpanStore (see SectionDetector)."""
+    detector = SectionDetector(patterns)
+    return detector.feed(store.iter_spans(detector.roles))
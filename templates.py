@@ -0,0 +1,195 @@
+"""Persistent, searchable template library backed by SQLite.
+
+Templates live in one SQLite file (default ``~/.local/share/prompt-builder/
+templates.db``, or ``$PROMPT_BUILDER_TEMPLATES``). The built-in techniques
+from prompt_data.py are seeded into it and kept in sync; any number of
+internal templates can be imported on top. Name, description and use_case
+are indexed with FTS5 (with prefix indexes, so search-as-you-type stays in
+the millisecond range for tens of thousands of templates) and results are
+ranked with bm25, name matches weighted highest. SQLite builds without FTS5
+fall back to a LIKE scan. Only the requested page of results is fetched.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+
+from prompt_data import PROMPT_TECHNIQUES_DATA
+
+SCHEMA_VERSION = 1
+PAGE_SIZE = 50 # Results fetched per search request
+RANK_WEIGHTS = (10.0, 2.0, 1.0) # bm25 weights for name, description, use_case
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL DEFAULT '',
+    use_case TEXT NOT NULL DEFAULT '',
+    template TEXT NOT NULL,
+    builtin INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS templates_name ON templates (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# External-content FTS table kept in sync with templates by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS templates_fts USING fts5(
+    name, description, use_case,
+    content='templates', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+);
+CREATE TRIGGER IF NOT EXISTS templates_ai AFTER INSERT ON templates BEGIN
+    INSERT INTO templates_fts (rowid, name, description, use_case)
+    VALUES (new.id, new.name, new.description, new.use_case);
+END;
+CREATE TRIGGER IF NOT EXISTS templates_ad AFTER DELETE ON templates BEGIN
+    INSERT INTO templates_fts (templates_fts, rowid, name, description, use_case)
+    VALUES ('delete', old.id, old.name, old.description, old.use_case);
+END;
+CREATE TRIGGER IF NOT EXISTS templates_au AFTER UPDATE ON templates BEGIN
+    INSERT INTO templates_fts (templates_fts, rowid, name, description, use_case)
+    VALUES ('delete', old.id, old.name, old.description, old.use_case);
+    INSERT INTO templates_fts (rowid, name, description, use_case)
+    VALUES (new.id, new.name, new.description, new.use_case);
+END;
+"""
+
+
+def default_path():
+    path = os.environ.get("PROMPT_BUILDER_TEMPLATES")
+    if path:
+        return path
+    base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "prompt-builder", "templates.db")
+
+
+def _terms(query):
+    return re.findall(r"[^\W_]+", query.lower()) # Same word characters as the unicode61 tokenizer
+
+
+def _like_escape(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class TemplateStore:
+    """Template library in SQLite; search() returns ranked (name, description) pages."""
+
+    def __init__(self, path=None, builtins=PROMPT_TECHNIQUES_DATA):
+        path = path or default_path()
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Template library unavailable ({e}); using built-in templates only.") # Debugging
+            path = ":memory:"
+            self.db = sqlite3.connect(path)
+            self.db.executescript(_SCHEMA)
+        self.path = path
+        try:
+            self.db.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError: # SQLite built without FTS5
+            self.fts = False
+        self._sync_builtins(builtins)
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _sync_builtins(self, builtins):
+        """Re-seeds the built-in templates when prompt_data.py has changed."""
+        digest = hashlib.blake2b(json.dumps([SCHEMA_VERSION, self.fts, builtins], sort_keys=True).encode("utf-8"),
+                                 digest_size=16).hexdigest()
+        if self._meta("builtins") == digest:
+            return
+        with self.db:
+            self.db.execute("DELETE FROM templates WHERE builtin = 1")
+            self._insert(builtins.values(), builtin=True)
+            if self.fts:
+                self.db.execute("INSERT INTO templates_fts (templates_fts) VALUES ('rebuild')")
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('builtins', ?)", (digest,))
+
+    def _insert(self, entries, builtin=False):
+        rows = ((entry["name"], entry.get("description", ""), entry.get("use_case", ""), entry["template"], int(builtin))
+                for entry in entries)
+        # An imported template replaces any earlier one with the same name; built-ins never replace imports
+        conflict = ("DO NOTHING" if builtin else
+                    "DO UPDATE SET description = excluded.description, use_case = excluded.use_case, "
+                    "template = excluded.template, builtin = 0")
+        self.db.executemany("INSERT INTO templates (name, description, use_case, template, builtin) "
+                            f"VALUES (?, ?, ?, ?, ?) ON CONFLICT (name) {conflict}", rows)
+
+    def add(self, entries):
+        """Adds or replaces templates; entries are dicts with name, template and optional description/use_case."""
+        with self.db:
+            self._insert(entries)
+
+    def import_file(self, path):
+        """Imports a JSON file: a list of template dicts, or {name: dict} like PROMPT_TECHNIQUES_DATA.
+
+        Returns the number of templates imported.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [dict(entry, name=entry.get("name", name)) if isinstance(entry, dict) else entry
+                    for name, entry in data.items()]
+        if not isinstance(data, list):
+            raise ValueError("Expected a list of templates or a {name: template} object")
+        for entry in data:
+            if not isinstance(entry, dict) or not entry.get("name") or "template" not in entry:
+                raise ValueError(f"Template entries need a name and a template: {str(entry)[:80]}")
+            for field in ("name", "template", "description", "use_case"):
+                if field in entry and not isinstance(entry[field], str):
+                    raise ValueError(f"Template field {field!r} must be a string: {str(entry)[:80]}")
+        self.add(data)
+        return len(data)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM templates").fetchone()[0]
+
+    def get(self, name):
+        """The template dict (name, description, use_case, template) or None."""
+        row = self.db.execute("SELECT name, description, use_case, template FROM templates WHERE name = ?",
+                              (name,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("name", "description", "use_case", "template"), row))
+
+    def search(self, query="", limit=PAGE_SIZE, offset=0):
+        """Best matches for a search-as-you-type query as [(name, description)].
+
+        Every word must match the start of a word in the name, description or
+        use case. An empty query lists the built-ins first, then the rest by name.
+        """
+        terms = _terms(query)
+        if not terms:
+            # Built-ins first, in prompt_data.py order, then everything else alphabetically
+            sql = ("SELECT name, description FROM templates "
+                   "ORDER BY builtin DESC, CASE WHEN builtin THEN id END, name COLLATE NOCASE LIMIT ? OFFSET ?")
+            return self.db.execute(sql, (limit, offset)).fetchall()
+        if self.fts:
+            match = " ".join(f'"{term}"*' for term in terms)
+            # Rank inside the FTS table and join only the requested page
+            sql = ("SELECT t.name, t.description FROM (SELECT rowid, "
+                   f"bm25(templates_fts, {', '.join(map(str, RANK_WEIGHTS))}) AS score FROM templates_fts "
+                   "WHERE templates_fts MATCH ? ORDER BY score LIMIT ? OFFSET ?) hits "
+                   "JOIN templates t ON t.id = hits.rowid ORDER BY hits.score, t.name COLLATE NOCASE")
+            return self.db.execute(sql, (match, limit, offset)).fetchall()
+        # No FTS5: substring scan, names starting with the first word first
+        where, params = [], []
+        for term in terms:
+            pattern = "%" + _like_escape(term) + "%"
+            where.append("(name LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\' OR use_case LIKE ? ESCAPE '\\')")
+            params += [pattern] * 3
+        sql = (f"SELECT name, description FROM templates WHERE {' AND '.join(where)} "
+               "ORDER BY name NOT LIKE ? ESCAPE '\\', name COLLATE NOCASE LIMIT ? OFFSET ?")
+        return self.db.execute(sql, params + [_like_escape(terms[0]) + "%", limit, offset]).fetchall()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,317 @@
+"""Offline token estimates, per-section token budgets and context packing.
+
+Text is split the way GPT-style byte-level BPE tokenizers pre-tokenize it
+(words with their leading space, runs of up to three digits, punctuation
+runs, newline runs). With a vocab file in tiktoken format (one
+"<base64 token> <rank>" per line, e.g. ``cl100k_base.tiktoken``), each piece
+is then merged exactly like the real tokenizer, so counts only differ where
+Python's ``re`` approximates the Unicode classes. Without one, a piece counts
+as one token plus extra tokens for words likely to be split and for non-ASCII
+runs, which is a cheaper and rougher estimate (see
+benchmarks/token_reference.json for how rough).
+
+Counts are memoised per block: the text is cut after each newline that is
+followed by a non-space character, which is always a pre-token boundary, so
+block counts add up to the count of the whole text. IncrementalTokenCounter
+recounts only the blocks an edit touches, using the edit bounds the
+incremental analyzer already has.
+"""
+import base64
+import json
+import os
+import re
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+
+# GPT-4 style pre-tokenizer, with [^\W\d_] standing in for \p{L} and \d for \p{N}
+PRETOKEN_RE = re.compile(r"""'(?i:[sdmt]|ll|ve|re)|(?:[^\r\n\w]|_)?[^\W\d_]+|\d{1,3}| ?(?:[^\s\w]|_)+[\r\n]*"""
+                         r"""|\s*[\r\n]+|\s+(?!\S)|\s+""")
+BLOCK_SPLIT_RE = re.compile(r"(?<=\n)(?=\S)")
+WORD_RE = re.compile(r"( ?)([^\W\d_]{3,})")
+NON_ASCII_RE = re.compile(r"[^\x00-\x7f]+")
+# Heuristic word splits, fitted to cl100k_base on English text. A lowercase or capitalised
+# word after a space is usually one token however long it is (only rare words split, and
+# those cannot be told apart without a vocab); at a line start or after punctuation words
+# split sooner, and all-caps or mixed-case words (identifiers, acronyms) sooner still.
+SPACED_WORD_LETTERS = 11 # Lowercase/capitalised word after a space: one extra token per
+SPACED_WORD_CHARS = 6 # SPACED_WORD_CHARS letters beyond SPACED_WORD_LETTERS
+BARE_WORD_LETTERS = 2 # The same for such a word without a leading space
+BARE_WORD_CHARS = 5
+MIXED_CASE_CHARS = 4 # Any other word: one extra token per MIXED_CASE_CHARS letters
+NON_ASCII_BYTES = 3 # Heuristic: UTF-8 bytes per token in non-ASCII text
+BLOCK_CACHE_ENTRIES = 50_000
+BLOCK_CACHE_MAX_CHARS = 4096 # Longer blocks are counted every time rather than kept as cache keys
+PIECE_CACHE_ENTRIES = 200_000
+VOCAB_ENV = "PROMPT_BUILDER_VOCAB"
+
+
+def load_vocab(path):
+    """Reads a tiktoken-format BPE file into {token bytes: merge rank}."""
+    ranks = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+def _bpe_count(piece, ranks):
+    """Number of tokens byte-level BPE produces for one pre-token."""
+    if piece in ranks:
+        return 1
+    parts = [piece[i:i + 1] for i in range(len(piece))]
+    while len(parts) > 1:
+        best, best_rank = None, None
+        for i in range(len(parts) - 1):
+            rank = ranks.get(parts[i] + parts[i + 1])
+            if rank is not None and (best_rank is None or rank < best_rank):
+                best, best_rank = i, rank
+        if best is None:
+            break
+        parts[best:best + 2] = [parts[best] + parts[best + 1]]
+    return len(parts)
+
+
+class TokenEstimator:
+    """Counts tokens with a BPE vocab if one is given, otherwise estimates them."""
+
+    def __init__(self, vocab_path=None):
+        self.vocab_path = vocab_path
+        self.ranks = load_vocab(vocab_path) if vocab_path else None
+        self._blocks = {} # block text -> token count
+        self._pieces = {} # pre-token -> token count (vocab mode)
+
+    @property
+    def exact(self):
+        return self.ranks is not None
+
+    def count(self, text):
+        """Token count of text (memoised per block)."""
+        return sum(map(self.count_block, BLOCK_SPLIT_RE.split(text))) if text else 0
+
+    def count_block(self, block):
+        if len(block) > BLOCK_CACHE_MAX_CHARS:
+            return self._count(block)
+        count = self._blocks.get(block)
+        if count is None:
+            if len(self._blocks) >= BLOCK_CACHE_ENTRIES:
+                self._blocks.clear()
+            count = self._blocks[block] = self._count(block)
+        return count
+
+    def _count(self, text):
+        if self.ranks is not None:
+            pieces, ranks, total = self._pieces, self.ranks, 0
+            for piece in PRETOKEN_RE.findall(text):
+                count = pieces.get(piece)
+                if count is None:
+                    if len(pieces) >= PIECE_CACHE_ENTRIES:
+                        pieces.clear()
+                    count = pieces[piece] = _bpe_count(piece.encode("utf-8"), ranks)
+                total += count
+            return total
+        total = len(PRETOKEN_RE.findall(text))
+        for space, word in WORD_RE.findall(text):
+            if not word.isascii(): # Charged by the non-ASCII rule below
+                continue
+            if word[1:].islower():
+                if space:
+                    extra = (len(word) - SPACED_WORD_LETTERS) // SPACED_WORD_CHARS
+                else:
+                    extra = (len(word) - BARE_WORD_LETTERS) // BARE_WORD_CHARS
+            else:
+                extra = len(word) // MIXED_CASE_CHARS
+            if extra > 0:
+                total += extra
+        for run in NON_ASCII_RE.findall(text):
+            total += max(0, len(run.encode("utf-8")) // NON_ASCII_BYTES - 1)
+        return total
+
+
+_DEFAULT_ESTIMATOR = None
+
+
+def default_estimator():
+    """Shared estimator; uses the vocab file named by $PROMPT_BUILDER_VOCAB if it can be read."""
+    global _DEFAULT_ESTIMATOR
+    if _DEFAULT_ESTIMATOR is None:
+        path = os.environ.get(VOCAB_ENV)
+        try:
+            _DEFAULT_ESTIMATOR = TokenEstimator(path)
+        except (OSError, ValueError) as e:
+            print(f"Could not load token vocab {path}: {e}", file=sys.stderr) # Debugging
+            _DEFAULT_ESTIMATOR = TokenEstimator()
+    return _DEFAULT_ESTIMATOR
+
+
+class IncrementalTokenCounter:
+    """Keeps the token count of a changing text, recounting only the blocks an edit touches."""
+
+    def __init__(self, estimator=None):
+        self.estimator = estimator or default_estimator()
+        self.reset()
+
+    def reset(self):
+        self.text = ""
+        self.lengths = [] # Characters per block
+        self.counts = [] # Tokens per block
+        self.total = 0
+
+    def update(self, text, bounds):
+        """Returns the token count of text.
+
+        bounds is (start, old_end, new_end) with the previous text's
+        [start:old_end] replaced by text[start:new_end], as returned by
+        incremental.edit_bounds or changed_region; after reset() pass (0, 0, len(text)).
+        """
+        start, old_end, new_end = bounds
+        ends = list(accumulate(self.lengths))
+        # From the block holding the character before the edit (its start cannot move) to the
+        # block holding the character after it (so the block boundary after the region is intact)
+        lo = bisect_right(ends, start - 1) if start else 0
+        hi = bisect_right(ends, old_end)
+        region_start = ends[lo - 1] if lo else 0
+        region_end = ends[hi] if hi < len(ends) else len(self.text)
+        blocks = BLOCK_SPLIT_RE.split(text[region_start:region_end + new_end - old_end])
+        if blocks == [""]:
+            blocks = []
+        counts = [self.estimator.count_block(block) for block in blocks]
+        self.total += sum(counts) - sum(self.counts[lo:hi + 1])
+        self.lengths[lo:hi + 1] = [len(block) for block in blocks]
+        self.counts[lo:hi + 1] = counts
+        self.text = text
+        return self.total
+
+
+def token_budget(prompt, store=None, estimator=None, analyzer=None):
+    """Tokens per layout section (see layout.py) and per element.
+
+    Sections take their element from their label; unlabelled sections count
+    as "Other". Returns {"total", "static", "variable", "prefix", "by_element", "sections"}.
+    """
+    from layout import analyze_layout
+
+    estimator = estimator or default_estimator()
+    report = analyze_layout(prompt, store, analyzer)
+    by_element, sections = {}, []
+    static = variable = 0
+    for section in report.sections:
+        tokens = estimator.count(prompt[section.start:section.end])
+        variable_tokens = estimator.count(prompt[section.variable_start:section.end])
+        static += tokens - variable_tokens
+        variable += variable_tokens
+        element = section.element or "Other"
+        by_element[element] = by_element.get(element, 0) + tokens
+        sections.append({"start": section.start, "end": section.end, "label": section.label, "element": element,
+                         "kind": section.kind, "tokens": tokens, "variable_tokens": variable_tokens})
+    return {
+        "total": estimator.count(prompt),
+        "static": static,
+        "variable": variable,
+        "prefix": estimator.count(prompt[:report.prefix_chars]),
+        "by_element": by_element,
+        "sections": sections,
+    }
+
+
+# --- Context packing ---
+
+CONTEXT_SLOT_RE = re.compile(r"(?i)\{\{\s*context\s*\}\}|\{context\}|<<\s*context\s*>>|\[[^\[\]\n]*context[^\[\]\n]*\]")
+CHUNK_SEPARATOR = "\n\n"
+
+
+class PackResult:
+    """Context chunks chosen to fit a token budget, and the filled-in prompt."""
+
+    def __init__(self, prompt, selected, dropped, tokens, budget):
+        self.prompt = prompt
+        self.selected = selected # Indices of the chunks used, in input order
+        self.dropped = dropped # Indices of the chunks that did not fit
+        self.tokens = tokens # Estimated tokens of the packed prompt
+        self.budget = budget
+
+    def to_dict(self):
+        return {"tokens": self.tokens, "budget": self.budget, "selected": self.selected,
+                "dropped": self.dropped, "prompt": self.prompt}
+
+
+def pack_context(template, chunks, budget, estimator=None):
+    """Fills the template's context slot with as many chunks as fit in budget tokens.
+
+    chunks are strings in priority order (e.g. retrieval rank). Each is taken if
+    it still fits, otherwise skipped, so a long chunk never blocks shorter ones
+    behind it; the chosen chunks keep their input order. The slot is the first
+    "{{context}}", "{context}", "<<context>>" or "[...context...]" placeholder;
+    without one, chunks are appended to the template.
+    """
+    estimator = estimator or default_estimator()
+    slot = CONTEXT_SLOT_RE.search(template)
+    if slot is None:
+        head, tail = template + CHUNK_SEPARATOR, ""
+    else:
+        head, tail = template[:slot.start()], template[slot.end():]
+    used = estimator.count(head) + estimator.count(tail)
+    separator = estimator.count(CHUNK_SEPARATOR)
+    selected, dropped = [], []
+    for i, chunk in enumerate(chunks):
+        # Block-wise counts of separate pieces can differ from the joined text by a token
+        # at each seam, so the final total is recounted below
+        cost = estimator.count(chunk) + (separator if selected else 0)
+        if used + cost <= budget:
+            selected.append(i)
+            used += cost
+        else:
+            dropped.append(i)
+    while True:
+        prompt = head + CHUNK_SEPARATOR.join(chunks[i] for i in selected) + tail
+        tokens = estimator.count(prompt)
+        if tokens <= budget or not selected:
+            return PackResult(prompt, selected, dropped, tokens, budget)
+        dropped.append(selected.pop()) # Seams pushed it over: give up the lowest-priority chunk
+        dropped.sort()
+
+
+def read_chunks(path):
+    """Context chunks from a file: JSONL with a "text" field per line, or blank-line separated text."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        data = f.read()
+    lines = [line for line in data.splitlines() if line.strip()]
+    try:
+        records = [json.loads(line) for line in lines]
+    except ValueError:
+        records = None
+    if records and all(isinstance(record, dict) and isinstance(record.get("text"), str) for record in records):
+        return [record["text"] for record in records]
+    return [chunk.strip() for chunk in re.split(r"\n\s*\n", data) if chunk.strip()]
+
+
+def run_budget(path, out=None):
+    """Writes the token budget of a prompt file as one JSON object."""
+    out = out or sys.stdout
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            prompt = f.read().strip()
+    except OSError as e:
+        out.write(json.dumps({"path": path, "error": str(e)}) + "\n")
+        return 1
+    record = {"path": path, "exact": default_estimator().exact}
+    record.update(token_budget(prompt))
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return 0
+
+
+def run_pack(template_path, chunks_path, budget, out=None):
+    """Packs the chunks of chunks_path into the template at template_path and writes the result as JSON."""
+    out = out or sys.stdout
+    try:
+        with open(template_path, encoding="utf-8", errors="replace") as f:
+            template = f.read().strip()
+        chunks = read_chunks(chunks_path)
+    except OSError as e:
+        out.write(json.dumps({"error": str(e)}) + "\n")
+        return 1
+    result = pack_context(template, chunks, budget)
+    out.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+    return 0 if result.tokens <= budget else 1
@@ -0,0 +1,87 @@
+"""Background analysis worker so the Tk main loop never runs a scan.
+
+Edits are submitted with an increasing generation number. Only the newest
+pending edit is analysed; a scan in progress is abandoned at its next
+checkpoint as soon as a newer edit arrives. Finished results are put on a
+queue that the GUI drains from a Tk ``after`` callback.
+"""
+import queue
+import sys
+import threading
+
+from highlight import LineIndex
+from incremental import IncrementalAnalyzer
+from profiling import PROFILER, stage
+from tokens import token_budget
+
+BUDGET_MAX_CHARS = 50_000 # Per-section token budgets are skipped for longer prompts
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside the worker when a newer edit supersedes the current one."""
+
+
+class AnalysisWorker:
+    """Runs IncrementalAnalyzer.update on a daemon thread, newest edit first."""
+
+    def __init__(self, incremental=None):
+        self.incremental = incremental or IncrementalAnalyzer()
+        self.results = queue.Queue() # (generation, IncrementalResult or the exception it failed with) pairs
+        self._condition = threading.Condition()
+        self._pending = None # (generation, prompt) waiting to be analysed
+        self._latest = 0 # Newest generation submitted
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="analysis-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, generation, prompt):
+        """Queues prompt for analysis, replacing (and cancelling) any older edit."""
+        with self._condition:
+            self._pending = (generation, prompt)
+            self._latest = generation
+            self._condition.notify()
+
+    def stop(self):
+        """Stops the worker thread after the current checkpoint."""
+        with self._condition:
+            self._stopped = True
+            self._latest = -1 # Cancels any scan in progress
+            self._condition.notify()
+
+    def _checkpoint(self, generation):
+        if generation != self._latest:
+            raise AnalysisCancelled()
+
+    def _run(self):
+        try:
+            PROFILER.start_cprofile() # No-op unless cProfile output was requested
+        except Exception as e: # Profiling is optional; never lose the worker over it
+            print(f"Could not start cProfile in the analysis worker: {e}", file=sys.stderr)
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, prompt = self._pending
+                self._pending = None
+            try:
+                with stage("analysis"):
+                    result = self.incremental.update(prompt, checkpoint=lambda: self._checkpoint(generation))
+            except AnalysisCancelled:
+                if PROFILER.enabled:
+                    PROFILER.record("cancelled", 0) # Counts abandoned scans
+                continue
+            except Exception as e:
+                print(f"Analysis failed: {e}", file=sys.stderr) # Debugging
+                self.incremental.reset()
+                self.results.put((generation, e)) # Still answers this generation, so the GUI stops waiting
+                continue
+            with stage("line_index"):
+                result.line_index = LineIndex(prompt) # Built here so the Tk thread only looks up
+            result.budget = None
+            if len(prompt) <= BUDGET_MAX_CHARS:
+                analyzer = self.incremental.analyzer
+                with stage("budget"):
+                    result.budget = token_budget(prompt, result.store, analyzer.tokens, analyzer)
+            self.results.put((generation, result))